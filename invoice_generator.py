@@ -5,58 +5,59 @@ Invoice Generator - Timewarrior to LaTeX PDF Invoice Generator
 
 import sys
 import os
+import asyncio
+import calendar
 import subprocess
-import json
 from datetime import datetime, date
-from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
 import click
 
 from src.config import ConfigManager
 from src.parser import TimewarriorParser
-from src.models import Invoice, Biller, Client, Address, BillableItem, InvoiceNumberGenerator, InvoiceCalculator, InvoiceValidator
+from src.models import Invoice, Biller, Client, Address, BillableItem, InvoiceNumberGenerator, InvoiceCalculator, InvoiceValidationError
 from src.generator import LaTeXInvoiceGenerator
-from src.compiler import PDFGenerator, CompilationError
+from src.compiler import (
+  PDFGenerator, CompilationError, LaTeXEnvironmentChecker, resolve_command
+)
 
 
-def generate_output_path(client_id: str, client_data: dict, invoice_number: str, start_date: str) -> str:
+def generate_output_path(client_id: str, client_data: dict, invoice_number: str, start_date: date) -> str:
   """Generate organized output path: output/{client}/{year}/{month}/{prefix}-{hash}.pdf"""
-  # Parse start date to get year and month
-  start_dt = datetime.strptime(start_date, '%Y-%m-%d')
-  year = str(start_dt.year)
-  month = f"{start_dt.month:02d}"
+  year = str(start_date.year)
+  month = f"{start_date.month:02d}"
   
   # Create directory structure
-  output_dir = Path("output") / client_id / year / month
-  output_dir.mkdir(parents=True, exist_ok=True)
+  output_dir = os.path.join("output", client_id, year, month)
+  os.makedirs(output_dir, exist_ok=True)
   
   # Generate filename: {prefix}-{hash}.pdf
   filename = f"{invoice_number}.pdf"
   
-  return str(output_dir / filename)
+  return os.path.join(output_dir, filename)
+
+
+# LaTeX intermediates removed next to a generated PDF (the .tex is kept)
+INTERMEDIATE_SUFFIXES = frozenset({'aux', 'log', 'out', 'fls', 'fdb_latexmk', 'synctex.gz'})
 
 
 def cleanup_intermediate_files(output_path: str, verbose: bool = False):
   """Clean up intermediate LaTeX files except for the .tex file."""
-  output_dir = Path(output_path).parent
-  output_stem = Path(output_path).stem
-  
-  # Files to delete
-  files_to_delete = [
-    output_dir / f"{output_stem}.aux",
-    output_dir / f"{output_stem}.log",
-    output_dir / f"{output_stem}.out",
-    output_dir / f"{output_stem}.fls",
-    output_dir / f"{output_stem}.fdb_latexmk",
-    output_dir / f"{output_stem}.synctex.gz"
-  ]
-  
-  for file_path in files_to_delete:
-    if file_path.exists():
-      file_path.unlink()
-      if verbose:
-        click.echo(f"Cleaned up: {file_path}")
+  output_dir = os.path.dirname(output_path) or '.'
+  prefix = os.path.splitext(os.path.basename(output_path))[0] + '.'
+
+  # One directory scan instead of a stat per candidate file
+  with os.scandir(output_dir) as entries:
+    for entry in entries:
+      name = entry.name
+      if name.startswith(prefix) and name[len(prefix):] in INTERMEDIATE_SUFFIXES:
+        os.unlink(entry.path)
+        if verbose:
+          click.echo(f"Cleaned up: {entry.path}")
+
+
+class InvoiceGenerationError(Exception):
+  """Raised when an invoice can't be generated for a client and period."""
 
 
 @click.command()
@@ -69,9 +70,11 @@ def cleanup_intermediate_files(output_path: str, verbose: bool = False):
 @click.option('--format', 'export_format', default='json', type=click.Choice(['json', 'csv']),
               help='Timewarrior export format')
 @click.option('--dry-run', is_flag=True, help='Generate LaTeX without compiling to PDF')
+@click.option('--no-cache', is_flag=True, help='Always reparse Timewarrior export data')
 @click.option('--verbose', '-v', is_flag=True, help='Verbose output')
 def main(start_date: str, end_date: str, client: str, output: str,
-         config: str, template: str, export_format: str, dry_run: bool, verbose: bool):
+         config: str, template: str, export_format: str, dry_run: bool,
+         no_cache: bool, verbose: bool):
   """Generate invoice from Timewarrior data."""
   try:
     # Set default config path if not specified
@@ -80,167 +83,222 @@ def main(start_date: str, end_date: str, client: str, output: str,
     
     # Load configuration
     config_manager = ConfigManager(config)
-    invoice_config = config_manager.load_config()
+    config_manager.load_config()
 
     if verbose:
       click.echo("Configuration loaded successfully")
       click.echo(f"Starting invoice generation for {client} from {start_date} to {end_date}")
 
-    # Validate client exists
-    client_data = config_manager.get_client(client)
-    if not client_data:
-      click.echo(f"Error: Client '{client}' not found in configuration", err=True)
-      click.echo("Available clients:", err=True)
-      for client_id in invoice_config.clients.keys():
-        click.echo(f"  - {client_id}", err=True)
+    try:
+      generate_invoice(config_manager, client, start_date, end_date, output, template,
+                       export_format, dry_run, not no_cache, verbose)
+    except CompilationError as e:
+      click.echo(f"PDF compilation failed: {e.message}", err=True)
+      if verbose and e.latex_output:
+        click.echo("LaTeX compilation output:", err=True)
+        click.echo(e.latex_output, err=True)
       sys.exit(1)
 
-    # Export Timewarrior data
-    timew_data = export_timewarrior_data(start_date, end_date, export_format, verbose)
-
+  except Exception as e:
+    click.echo(f"Error: {str(e)}", err=True)
     if verbose:
-      click.echo(f"Exported {len(timew_data)} time tracking entries")
+      import traceback
+      traceback.print_exc()
+    sys.exit(1)
 
-    # Parse Timewarrior data
-    parser = TimewarriorParser()
-    time_entries = parser.parse_export_data(timew_data, export_format)
 
-    if not time_entries:
-      click.echo("No time tracking entries found for the specified period", err=True)
-      sys.exit(1)
+def prepare_invoice(config_manager: ConfigManager, client: str, start_date: str, end_date: str,
+                    output: Optional[str] = None, template: Optional[str] = None,
+                    export_format: str = 'json', use_cache: bool = True,
+                    verbose: bool = False) -> Tuple[Invoice, str, str]:
+  """
+  Run the export → parse → LaTeX stages for one client and period.
 
-    # Filter entries for the specified client
-    client_entries = filter_entries_for_client(time_entries, client)
+  Returns:
+    Tuple of (invoice, output PDF path, LaTeX source)
 
-    if not client_entries:
-      click.echo(f"No time tracking entries found for client '{client}' in the specified period", err=True)
-      sys.exit(1)
+  Raises:
+    InvoiceGenerationError: If the invoice can't be built from the available data
+  """
+  invoice_config = config_manager.config
 
-    # Apply hourly rates
-    billable_items = parser.apply_hourly_rates(client_entries, config_manager)
+  # Validate client exists
+  client_data = config_manager.get_client(client)
+  if not client_data:
+    available = ''.join(f"\n  - {client_id}" for client_id in invoice_config.clients.keys())
+    raise InvoiceGenerationError(
+      f"Client '{client}' not found in configuration\nAvailable clients:{available}"
+    )
 
-    if verbose:
-      total_hours = sum(item.hours_worked for item in billable_items)
-      total_amount = sum(item.amount for item in billable_items)
-      click.echo(f"Generated {len(billable_items)} billable items: {total_hours:.2f} hours, ${total_amount:.2f}")
-
-    # Create invoice
-    invoice = create_invoice(client, client_data, billable_items, start_date, end_date, invoice_config, verbose)
-
-    # Validate invoice
-    errors = InvoiceValidator.validate_invoice(invoice)
-    if errors:
-      click.echo("Invoice validation errors:", err=True)
-      for error in errors:
-        click.echo(f"  - {error}", err=True)
-      sys.exit(1)
+  # Parse the billing period once; later stages take date objects
+  try:
+    period_start = date.fromisoformat(start_date)
+    period_end = date.fromisoformat(end_date)
+  except ValueError as e:
+    raise InvoiceGenerationError(f"Invalid billing period: {e}")
 
-    if verbose:
-      click.echo(f"Invoice {invoice.invoice_number} created successfully")
+  # Export Timewarrior data
+  timew_data = export_timewarrior_data(start_date, end_date, export_format, verbose)
+
+  if verbose:
+    click.echo(f"Exported {len(timew_data)} bytes of time tracking data")
 
-    # Generate organized output path if not specified
-    if not output:
-      output = generate_output_path(client, client_data, invoice.invoice_number, start_date)
-      if verbose:
-        click.echo(f"Using organized output path: {output}")
+  # Parse Timewarrior data
+  parser = TimewarriorParser()
+  time_entries = parser.parse_export_data(timew_data, export_format, use_cache=use_cache)
 
-    # Generate LaTeX
-    generator = LaTeXInvoiceGenerator(template)
-    latex_content = generator.generate_latex(invoice, start_date, end_date)
+  if not time_entries:
+    raise InvoiceGenerationError("No time tracking entries found for the specified period")
 
+  # Filter entries for the specified client
+  client_entries = filter_entries_for_client(time_entries, client)
+
+  if not client_entries:
+    raise InvoiceGenerationError(
+      f"No time tracking entries found for client '{client}' in the specified period"
+    )
+
+  # Apply hourly rates
+  billable_items = parser.apply_hourly_rates(client_entries, config_manager)
+
+  if verbose:
+    total_hours = sum(item.hours_worked for item in billable_items)
+    total_amount = InvoiceCalculator.calculate_subtotal(billable_items)
+    click.echo(f"Generated {len(billable_items)} billable items: {total_hours:.2f} hours, ${total_amount:.2f}")
+
+  # Create invoice (validated while it is constructed)
+  try:
+    invoice = create_invoice(client, client_data, billable_items, period_start, period_end,
+                             invoice_config, verbose)
+  except InvoiceValidationError as e:
+    raise InvoiceGenerationError(
+      "Invoice validation errors:" + ''.join(f"\n  - {error}" for error in e.errors)
+    )
+
+  if verbose:
+    click.echo(f"Invoice {invoice.invoice_number} created successfully")
+
+  # Generate organized output path if not specified
+  if not output:
+    output = generate_output_path(client, client_data, invoice.invoice_number, period_start)
     if verbose:
-      click.echo("LaTeX content generated")
+      click.echo(f"Using organized output path: {output}")
 
-    # Save LaTeX file if requested or in dry-run mode
-    if dry_run or verbose:
-      latex_file = output.replace('.pdf', '.tex')
-      with open(latex_file, 'w', encoding='utf-8') as f:
-        f.write(latex_content)
-      click.echo(f"LaTeX file saved: {latex_file}")
+  # Generate LaTeX
+  generator = LaTeXInvoiceGenerator(template)
+  latex_content = generator.generate_latex(invoice, start_date, end_date)
 
-    if dry_run:
-      click.echo("Dry run completed. LaTeX file generated but PDF compilation skipped.")
-      return
+  if verbose:
+    click.echo("LaTeX content generated")
 
-    # Compile to PDF
-    pdf_generator = PDFGenerator(invoice_config.latex_command)
+  return invoice, output, latex_content
 
-    try:
-      pdf_path = pdf_generator.generate_pdf(latex_content, output)
-      click.echo(f"PDF invoice generated successfully: {pdf_path}")
 
-      # Clean up intermediate files
-      cleanup_intermediate_files(output, verbose)
+def generate_invoice(config_manager: ConfigManager, client: str, start_date: str, end_date: str,
+                     output: Optional[str] = None, template: Optional[str] = None,
+                     export_format: str = 'json', dry_run: bool = False,
+                     use_cache: bool = True, verbose: bool = False) -> str:
+  """
+  Run the full export → parse → LaTeX → PDF pipeline for one client and period.
 
-      if verbose:
-        click.echo(f"Invoice details:")
-        click.echo(f"  Number: {invoice.invoice_number}")
-        click.echo(f"  Client: {invoice.client.name}")
-        click.echo(f"  Period: {start_date} to {end_date}")
-        click.echo(f"  Total: {InvoiceCalculator.format_currency(invoice.total_amount)}")
+  Returns:
+    Path of the generated PDF (or .tex file for dry runs)
 
-    except CompilationError as e:
-      click.echo(f"PDF compilation failed: {e.message}", err=True)
-      if verbose and e.latex_output:
-        click.echo("LaTeX compilation output:", err=True)
-        click.echo(e.latex_output, err=True)
-      sys.exit(1)
+  Raises:
+    InvoiceGenerationError: If the invoice can't be built from the available data
+    CompilationError: If PDF compilation fails
+  """
+  invoice, output, latex_content = prepare_invoice(
+    config_manager, client, start_date, end_date, output, template,
+    export_format, use_cache, verbose
+  )
 
-  except Exception as e:
-    click.echo(f"Error: {str(e)}", err=True)
-    if verbose:
-      import traceback
-      traceback.print_exc()
-    sys.exit(1)
+  # Save LaTeX file if requested or in dry-run mode
+  if dry_run or verbose:
+    latex_file = save_latex_file(output, latex_content)
 
+  if dry_run:
+    click.echo("Dry run completed. LaTeX file generated but PDF compilation skipped.")
+    return latex_file
 
-def export_timewarrior_data(start_date: str, end_date: str, format_type: str, verbose: bool) -> str:
-  """Export data from Timewarrior for the specified date range."""
+  # Compile to PDF
+  pdf_generator = PDFGenerator(config_manager.config.latex_command)
+  try:
+    pdf_path = pdf_generator.generate_pdf(latex_content, output)
+  finally:
+    pdf_generator.cleanup()
+
+  report_generated_pdf(invoice, pdf_path, start_date, end_date, verbose)
+  return pdf_path
+
+
+def save_latex_file(output: str, latex_content: str) -> str:
+  """Write the LaTeX source next to the output PDF and return its path."""
+  latex_file = output.replace('.pdf', '.tex')
+  with open(latex_file, 'w', encoding='utf-8') as f:
+    f.write(latex_content)
+  click.echo(f"LaTeX file saved: {latex_file}")
+  return latex_file
+
+
+def report_generated_pdf(invoice: Invoice, pdf_path: str, start_date: str, end_date: str,
+                         verbose: bool = False) -> None:
+  """Report a compiled invoice and remove LaTeX intermediates next to it."""
+  click.echo(f"PDF invoice generated successfully: {pdf_path}")
+
+  # Clean up intermediate files
+  cleanup_intermediate_files(pdf_path, verbose)
+
+  if verbose:
+    click.echo(f"Invoice details:")
+    click.echo(f"  Number: {invoice.invoice_number}")
+    click.echo(f"  Client: {invoice.client.name}")
+    click.echo(f"  Period: {start_date} to {end_date}")
+    click.echo(f"  Total: {InvoiceCalculator.format_currency(invoice.total_amount)}")
+
+
+def export_timewarrior_data(start_date: str, end_date: str, format_type: str, verbose: bool) -> bytes:
+  """Export data from Timewarrior for the specified date range as raw UTF-8 bytes."""
   try:
     # Build timew export command
-    cmd = ['timew', 'export', f'{start_date}', '-', f'{end_date}']
+    cmd = [resolve_command('timew'), 'export', f'{start_date}', '-', f'{end_date}']
 
     if verbose:
       click.echo(f"Running command: {' '.join(cmd)}")
 
-    # Execute timew export
-    result = subprocess.run(
-      cmd,
-      capture_output=True,
-      text=True,
-      timeout=30
-    )
+    # Execute timew export, reading the raw stdout pipe so the payload is
+    # handed to the parser as bytes without an intermediate str copy.
+    # close_fds=False is safe (our descriptors are non-inheritable) and lets
+    # CPython use posix_spawn() rather than fork()
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                          close_fds=False) as proc:
+      try:
+        raw, stderr = proc.communicate(timeout=30)
+      except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.communicate()
+        raise
 
-    if result.returncode != 0:
-      click.echo(f"Timewarrior export failed: {result.stderr}", err=True)
-      sys.exit(1)
+    if proc.returncode != 0:
+      raise InvoiceGenerationError(f"Timewarrior export failed: {stderr.decode('utf-8', 'replace')}")
 
-    return result.stdout
+    return raw
 
   except subprocess.TimeoutExpired:
-    click.echo("Timewarrior export timed out", err=True)
-    sys.exit(1)
+    raise InvoiceGenerationError("Timewarrior export timed out")
   except FileNotFoundError:
-    click.echo("Timewarrior command not found. Please ensure Timewarrior is installed and in PATH.", err=True)
-    sys.exit(1)
+    raise InvoiceGenerationError("Timewarrior command not found. Please ensure Timewarrior is installed and in PATH.")
 
 
 def filter_entries_for_client(entries: List, client_id: str) -> List:
   """Filter time entries for the specified client."""
-  client_entries = []
-
-  for entry in entries:
-    # Check if entry belongs to this client
-    if entry.project == client_id:
-      client_entries.append(entry)
-    elif entry.tags and client_id in entry.tags:
-      client_entries.append(entry)
-
-  return client_entries
+  # An entry belongs to the client if it's the entry's project or one of its tags
+  return [entry for entry in entries
+          if entry.project == client_id or client_id in entry.tags]
 
 
 def create_invoice(client_id: str, client_data: dict, billable_items: List[BillableItem],
-                  start_date: str, end_date: str, config, verbose: bool) -> Invoice:
+                  start_date: date, end_date: date, config, verbose: bool) -> Invoice:
   """Create an Invoice object from the provided data."""
 
   # Create biller
@@ -278,21 +336,26 @@ def create_invoice(client_id: str, client_data: dict, billable_items: List[Billa
   if billable_items:
     # Get the first and last entry times from the timewarrior data
     # We'll use the start_date and end_date as the time period
-    time_period_start = datetime.strptime(start_date, '%Y-%m-%d')
-    time_period_end = datetime.strptime(end_date, '%Y-%m-%d')
+    time_period_start = datetime.combine(start_date, datetime.min.time())
+    time_period_end = datetime.combine(end_date, datetime.min.time())
     # Use the midpoint of the time period as the timestamp
     time_period_midpoint = time_period_start + (time_period_end - time_period_start) / 2
   else:
     # Fallback to current time if no billable items
     time_period_midpoint = datetime.now()
   
-  total_hours = sum(item.hours_worked for item in billable_items)
-  projects = list(set(item.project for item in billable_items))
+  # One pass for the hour total and the distinct projects (in first-seen order)
+  total_hours = 0.0
+  seen_projects = {}
+  for item in billable_items:
+    total_hours += item.hours_worked
+    seen_projects[item.project] = None
+  projects = list(seen_projects)
 
   invoice_number = number_generator.generate_invoice_number(
     client_data['prefix'],
-    start_date,
-    end_date,
+    start_date.isoformat(),
+    end_date.isoformat(),
     total_hours,
     projects,
     time_period_midpoint
@@ -317,12 +380,162 @@ def create_invoice(client_id: str, client_data: dict, billable_items: List[Billa
     payment_terms=config.default_payment_terms,
     payment_instructions=config.default_payment_instructions,
     notes=config.default_notes,
-    terms_and_conditions=config.default_terms_and_conditions
+    terms_and_conditions=config.default_terms_and_conditions,
+    validate=True
   )
 
   return invoice
 
 
+def month_date_range(month: str) -> tuple:
+  """Return (first_day, last_day) as YYYY-MM-DD strings for a YYYY-MM month."""
+  year, month_number = (int(part) for part in month.split('-'))
+  last_day = calendar.monthrange(year, month_number)[1]
+  return f"{year:04d}-{month_number:02d}-01", f"{year:04d}-{month_number:02d}-{last_day:02d}"
+
+
+async def batch_main(config_manager: ConfigManager, jobs: List[Tuple[str, str, str]],
+                     template: Optional[str] = None, export_format: str = 'json',
+                     dry_run: bool = False, max_concurrency: Optional[int] = None,
+                     single_run: bool = False) -> List:
+  """
+  Generate one invoice per (client, start_date, end_date) job.
+
+  Each invoice is prepared (timew export, parsing, LaTeX rendering) in a
+  worker thread while earlier invoices are still compiling, and at most
+  max_concurrency LaTeX processes run at once.
+  With single_run, all invoices are compiled by one LaTeX run instead.
+
+  Returns:
+    One result per job, in order: the generated file path or the exception raised
+  """
+  if single_run and not dry_run:
+    return await asyncio.to_thread(batch_single_run, config_manager, jobs, template, export_format)
+
+  semaphore = asyncio.Semaphore(max_concurrency or os.cpu_count() or 1)
+
+  async def run(client: str, start_date: str, end_date: str) -> str:
+    # The timew export and parsing block, so keep them off the event loop
+    invoice, output, latex_content = await asyncio.to_thread(
+      prepare_invoice, config_manager, client, start_date, end_date,
+      template=template, export_format=export_format
+    )
+
+    if dry_run:
+      return save_latex_file(output, latex_content)
+
+    async with semaphore:
+      pdf_generator = PDFGenerator(config_manager.config.latex_command)
+      try:
+        pdf_path = await pdf_generator.generate_pdf_async(latex_content, output)
+      finally:
+        pdf_generator.cleanup()
+
+    report_generated_pdf(invoice, pdf_path, start_date, end_date)
+    return pdf_path
+
+  return await asyncio.gather(*(run(*job) for job in jobs), return_exceptions=True)
+
+
+def batch_single_run(config_manager: ConfigManager, jobs: List[Tuple[str, str, str]],
+                     template: Optional[str] = None, export_format: str = 'json') -> List:
+  """
+  Prepare every job, then compile all prepared invoices with one LaTeX run.
+
+  Returns:
+    One result per job, in order: the generated file path or the exception raised
+  """
+  results = []
+  prepared = []
+  for index, (client, start_date, end_date) in enumerate(jobs):
+    try:
+      invoice, output, latex_content = prepare_invoice(
+        config_manager, client, start_date, end_date,
+        template=template, export_format=export_format
+      )
+    except Exception as e:
+      results.append(e)
+      continue
+    results.append(None)
+    prepared.append((index, invoice, output, latex_content))
+
+  if not prepared:
+    return results
+
+  pdf_generator = PDFGenerator(config_manager.config.latex_command)
+  try:
+    pdf_generator.generate_batch([p[3] for p in prepared], [p[2] for p in prepared])
+  except CompilationError as e:
+    for index, *_ in prepared:
+      results[index] = e
+    return results
+  finally:
+    pdf_generator.cleanup()
+
+  for index, invoice, output, _ in prepared:
+    _, start_date, end_date = jobs[index]
+    report_generated_pdf(invoice, output, start_date, end_date)
+    results[index] = output
+
+  return results
+
+
+@click.command()
+@click.option('--clients', required=True, help='Comma-separated client identifiers (e.g., madrona,goodhertz)')
+@click.option('--months', required=True, help='Comma-separated billing months (YYYY-MM)')
+@click.option('--config', help='Configuration file path (default: ~/.config/timewarrior/invoice/config.yaml)')
+@click.option('--template', help='Custom LaTeX template path')
+@click.option('--format', 'export_format', default='json', type=click.Choice(['json', 'csv']),
+              help='Timewarrior export format')
+@click.option('--dry-run', is_flag=True, help='Generate LaTeX without compiling to PDF')
+@click.option('--jobs', '-j', type=int, default=None,
+              help='Maximum concurrent LaTeX compilations (default: CPU count)')
+@click.option('--single-run', is_flag=True,
+              help='Compile all invoices with one LaTeX run and split the result (requires qpdf)')
+def batch_generate(clients: str, months: str, config: str, template: str,
+                   export_format: str, dry_run: bool, jobs: Optional[int], single_run: bool):
+  """Generate invoices for several clients and months, compiling concurrently."""
+  try:
+    if not config:
+      config = os.path.expanduser("~/.config/timewarrior/invoice/config.yaml")
+
+    config_manager = ConfigManager(config)
+    config_manager.load_config()
+
+    client_ids = [c.strip() for c in clients.split(',') if c.strip()]
+    periods = [month_date_range(m.strip()) for m in months.split(',') if m.strip()]
+    jobs_list = [(client_id, start, end) for client_id in client_ids for start, end in periods]
+
+    # Probe the LaTeX installation once up front; the result is cached for
+    # every invoice compiled afterwards
+    if not dry_run:
+      checker = LaTeXEnvironmentChecker()
+      if not checker.check_latex_installation()[0]:
+        click.echo("No LaTeX installation found.", err=True)
+        click.echo(checker.get_installation_instructions(), err=True)
+        sys.exit(1)
+
+    results = asyncio.run(batch_main(config_manager, jobs_list, template, export_format,
+                                     dry_run, jobs, single_run))
+
+    failures = 0
+    for (client_id, start, _), result in zip(jobs_list, results):
+      if isinstance(result, CompilationError):
+        failures += 1
+        click.echo(f"✗ {client_id} {start[:7]}: PDF compilation failed: {result.message}", err=True)
+      elif isinstance(result, Exception):
+        failures += 1
+        click.echo(f"✗ {client_id} {start[:7]}: {str(result)}", err=True)
+
+    click.echo(f"Batch completed: {len(jobs_list) - failures} of {len(jobs_list)} invoices generated")
+    if failures:
+      sys.exit(1)
+
+  except Exception as e:
+    click.echo(f"Error: {str(e)}", err=True)
+    sys.exit(1)
+
+
 @click.command()
 @click.option('--config', help='Configuration file path (default: ~/.config/timewarrior/invoice/config.yaml)')
 def init_config(config: str):
@@ -422,6 +635,7 @@ def cli():
 
 # Add commands to group
 cli.add_command(main, name='generate')
+cli.add_command(batch_generate, name='batch')
 cli.add_command(init_config, name='init')
 cli.add_command(list_clients, name='clients')
 cli.add_command(check_environment, name='check')
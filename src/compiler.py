@@ -6,15 +6,120 @@ manages temporary files, and provides compilation status feedback.
 """
 
 import os
+import asyncio
+import functools
+import shlex
 import subprocess
 import tempfile
 import shutil
-from pathlib import Path
 from typing import Optional, Tuple, List
 import logging
 
 logger = logging.getLogger(__name__)
 
+@functools.lru_cache(maxsize=None)
+def resolve_command(command: str) -> str:
+  """Resolve command to an absolute path once per process (unchanged if not on PATH)."""
+  return shutil.which(command) or command
+
+
+def _quote_for_shell(path: str) -> str:
+  """Quote path for the shell latexmk runs its engine command through."""
+  # latexmk uses cmd.exe on Windows, which doesn't understand single quotes
+  if os.name == 'nt':
+    return subprocess.list2cmdline([path])
+  return shlex.quote(path)
+
+
+@functools.lru_cache(maxsize=None)
+def _command_available(command: str) -> bool:
+  """Run `command --version` once per process and report whether it worked."""
+  try:
+    # An absolute executable, no cwd and close_fds=False let CPython
+    # spawn with posix_spawn() instead of fork() + exec()
+    result = subprocess.run(
+      [resolve_command(command), "--version"],
+      capture_output=True,
+      text=True,
+      close_fds=False,
+      timeout=10
+    )
+    return result.returncode == 0
+  except (subprocess.TimeoutExpired, FileNotFoundError):
+    return False
+
+
+_BEGIN_DOCUMENT = "\\begin{document}"
+_END_DOCUMENT = "\\end{document}"
+
+
+def combine_documents(latex_documents: List[str]) -> Optional[str]:
+  r"""
+  Merge complete LaTeX documents into one master document.
+  
+  The preamble shared by all documents is emitted once. Whatever differs
+  in each document's preamble (e.g. its \fancyhead settings) is moved to
+  the start of that document's pages, and each document ends with a
+  \clearpage that records its last page in \jobname.pages so the combined
+  PDF can be split again.
+  
+  Args:
+    latex_documents: Complete LaTeX documents
+  
+  Returns:
+    The master document, or None if a document has no document environment
+  """
+  preambles = []
+  bodies = []
+  for document in latex_documents:
+    begin = document.find(_BEGIN_DOCUMENT)
+    end = document.rfind(_END_DOCUMENT)
+    if begin < 0 or end < begin:
+      return None
+    preambles.append(document[:begin])
+    bodies.append(document[begin + len(_BEGIN_DOCUMENT):end])
+  
+  # Cut the shared prefix back to a blank line so no command or group
+  # (such as a multi-line \fancyhead) is split between the two parts
+  shared = os.path.commonprefix(preambles)
+  boundary = shared.rfind("\n\n")
+  if boundary < 0:
+    return None
+  shared = shared[:boundary + 2]
+  
+  parts = [
+    shared,
+    "\\newwrite\\invoicepages\n",
+    "\\immediate\\openout\\invoicepages=\\jobname.pages\n",
+    _BEGIN_DOCUMENT + "\n"
+  ]
+  for preamble, body in zip(preambles, bodies):
+    parts.append(preamble[len(shared):])
+    parts.append(body)
+    parts.append("\\clearpage\n\\immediate\\write\\invoicepages{\\the\\numexpr\\value{page}-1\\relax}\n")
+  parts.append("\\immediate\\closeout\\invoicepages\n")
+  parts.append(_END_DOCUMENT + "\n")
+  
+  return "".join(parts)
+
+
+def summarize_latex_output(stdout: bytes, stderr: bytes) -> str:
+  """
+  Extract the TeX error messages from a failed run.
+  
+  TeX reports errors on stdout as lines starting with '!', followed by the
+  offending source line; stderr is used when no such lines are present.
+  """
+  lines = stdout.decode('utf-8', 'replace').splitlines()
+  errors = []
+  for index, line in enumerate(lines):
+    if line.startswith('!'):
+      errors.extend(lines[index:index + 3])
+  
+  if errors:
+    return "\n".join(errors)
+  return stderr.decode('utf-8', 'replace')
+
 
 class PDFCompiler:
   """Compiles LaTeX source code to PDF."""
@@ -26,16 +131,39 @@ class PDFCompiler:
     
     Args:
       latex_command: LaTeX compiler command (pdflatex, xelatex, etc.)
-      working_dir: Working directory for compilation
+        or an absolute path to one
+      working_dir: Working directory for compilation (a temporary
+        directory is created on first use if not given)
     """
     self.latex_command = latex_command
-    self.working_dir = working_dir or tempfile.mkdtemp()
+    # Resolved once so each compile spawns the engine without a PATH search
+    self.latex_path = resolve_command(latex_command)
+    self.working_dir = working_dir
     self.temp_files = []
+    
+    # Keep LaTeX's many small intermediate writes in RAM when a writable
+    # tmpfs is available; otherwise use the platform default temp dir
+    if os.path.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK):
+      self.temp_root = '/dev/shm'
+    else:
+      self.temp_root = None
+  
+  def _ensure_working_dir(self) -> str:
+    """Return the working directory, creating a temporary one if needed."""
+    if self.working_dir:
+      os.makedirs(self.working_dir, exist_ok=True)
+    else:
+      self.working_dir = tempfile.mkdtemp(dir=self.temp_root)
+      self.temp_files.append(self.working_dir)
+    return self.working_dir
   
   def compile_latex(self, latex_content: str, output_path: str) -> Tuple[bool, str]:
     """
     Compile LaTeX content to PDF.
     
+    The working directory is kept between calls so latexmk can reuse its
+    intermediate files; call cleanup() once all invoices are compiled.
+    
     Args:
       latex_content: LaTeX source code as string
       output_path: Path where PDF should be saved
@@ -44,79 +172,189 @@ class PDFCompiler:
       Tuple of (success: bool, message: str)
     """
     try:
-      # Create temporary working directory
-      temp_dir = tempfile.mkdtemp()
-      self.temp_files.append(temp_dir)
-      
-      # Write LaTeX content to temporary file
-      latex_file = os.path.join(temp_dir, "invoice.tex")
-      with open(latex_file, 'w', encoding='utf-8') as f:
-        f.write(latex_content)
+      temp_dir = self._ensure_working_dir()
+      pdf_file = self._remove_stale_pdf(temp_dir)
       
       # Run LaTeX compilation
-      success, message = self._run_latex_compilation(temp_dir, latex_file)
+      success, message = self._run_latex_compilation(temp_dir, latex_content)
       
-      if success:
-        # Copy PDF to output location
-        pdf_file = os.path.join(temp_dir, "invoice.pdf")
-        if os.path.exists(pdf_file):
-          shutil.copy2(pdf_file, output_path)
-          return True, f"PDF successfully generated: {output_path}"
-        else:
-          return False, "PDF file not found after compilation"
-      else:
-        return False, message
+      return self._collect_pdf(success, message, pdf_file, output_path)
     
     except Exception as e:
       return False, f"Compilation error: {str(e)}"
+  
+  async def compile_latex_async(self, latex_content: str, output_path: str) -> Tuple[bool, str]:
+    """
+    Compile LaTeX content to PDF without blocking the event loop.
+    
+    Concurrent calls must use separate PDFCompiler instances, since each
+    compiler has a single working directory.
+    
+    Args:
+      latex_content: LaTeX source code as string
+      output_path: Path where PDF should be saved
+    
+    Returns:
+      Tuple of (success: bool, message: str)
+    """
+    try:
+      temp_dir = self._ensure_working_dir()
+      pdf_file = self._remove_stale_pdf(temp_dir)
+      
+      # Run LaTeX compilation
+      success, message = await self._run_latex_compilation_async(temp_dir, latex_content)
+      
+      return self._collect_pdf(success, message, pdf_file, output_path)
     
-    finally:
-      # Clean up temporary files
-      self.cleanup()
+    except Exception as e:
+      return False, f"Compilation error: {str(e)}"
   
-  def _run_latex_compilation(self, temp_dir: str, latex_file: str) -> Tuple[bool, str]:
-    """Run the actual LaTeX compilation process."""
+  def compile_batch(self, latex_documents: List[str],
+                    output_paths: List[str]) -> Tuple[bool, str]:
+    """
+    Compile several invoices with a single LaTeX run.
+    
+    The documents are merged into one master document (see
+    combine_documents), compiled once, and the resulting PDF is split back
+    into one file per invoice with qpdf. Falls back to compiling each
+    document separately when qpdf is unavailable or the documents can't
+    be merged.
+    
+    Args:
+      latex_documents: Complete LaTeX documents sharing the same preamble
+      output_paths: Path where each document's PDF should be saved
+    
+    Returns:
+      Tuple of (success: bool, message: str)
+    """
+    master = None
+    if len(latex_documents) > 1 and _command_available("qpdf"):
+      master = combine_documents(latex_documents)
+    
+    if master is None:
+      for latex_content, output_path in zip(latex_documents, output_paths):
+        success, message = self.compile_latex(latex_content, output_path)
+        if not success:
+          return False, message
+      return True, f"{len(output_paths)} PDFs successfully generated"
+    
     try:
-      # First pass - generate PDF
-      cmd = [
-        self.latex_command,
-        "-interaction=nonstopmode",
-        "-output-directory=" + temp_dir,
-        latex_file
-      ]
+      temp_dir = self._ensure_working_dir()
+      pdf_file = self._remove_stale_pdf(temp_dir)
+      
+      success, message = self._run_latex_compilation(temp_dir, master)
+      if not success:
+        return False, message
       
+      return self._split_pdf(pdf_file, os.path.join(temp_dir, "invoice.pages"), output_paths)
+    
+    except Exception as e:
+      return False, f"Compilation error: {str(e)}"
+  
+  def _split_pdf(self, pdf_file: str, pages_file: str,
+                 output_paths: List[str]) -> Tuple[bool, str]:
+    """Split a combined PDF into output_paths using the recorded last pages."""
+    with open(pages_file, 'r', encoding='utf-8') as f:
+      last_pages = [int(line) for line in f if line.strip()]
+    
+    if len(last_pages) != len(output_paths):
+      return False, "Combined PDF does not match the number of invoices"
+    
+    first_page = 1
+    for last_page, output_path in zip(last_pages, output_paths):
       result = subprocess.run(
-        cmd,
-        cwd=temp_dir,
+        [resolve_command("qpdf"), "--empty", "--pages", pdf_file,
+         f"{first_page}-{last_page}", "--", output_path],
         capture_output=True,
         text=True,
-        timeout=60  # 60 second timeout
+        close_fds=False,
+        timeout=60
       )
+      if result.returncode != 0:
+        return False, f"Splitting combined PDF failed: {result.stderr}"
+      first_page = last_page + 1
+    
+    return True, f"{len(output_paths)} PDFs successfully generated"
+  
+  def _remove_stale_pdf(self, temp_dir: str) -> str:
+    """Remove the previous invoice.pdf from temp_dir and return its path."""
+    # A failed run must not be mistaken for a successful one
+    pdf_file = os.path.join(temp_dir, "invoice.pdf")
+    if os.path.exists(pdf_file):
+      os.unlink(pdf_file)
+    return pdf_file
+  
+  def _write_source(self, temp_dir: str, latex_content: str) -> str:
+    """Write invoice.tex into temp_dir for latexmk and return its path."""
+    latex_file = os.path.join(temp_dir, "invoice.tex")
+    with open(latex_file, 'w', encoding='utf-8') as f:
+      f.write(latex_content)
+    return latex_file
+  
+  def _collect_pdf(self, success: bool, message: str, pdf_file: str,
+                   output_path: str) -> Tuple[bool, str]:
+    """Copy the compiled PDF to its output location."""
+    if success:
+      # Copy PDF to output location
+      if os.path.exists(pdf_file):
+        shutil.copy2(pdf_file, output_path)
+        return True, f"PDF successfully generated: {output_path}"
+      else:
+        return False, "PDF file not found after compilation"
+    else:
+      return False, message
+  
+  def _latexmk_command(self, temp_dir: str, latex_file: str) -> List[str]:
+    """Build the latexmk command line for compiling latex_file."""
+    # latexmk reruns the engine only as often as the .aux files require,
+    # which for an invoice is almost always a single pass
+    return [
+      resolve_command("latexmk"),
+      "-pdf",
+      f"-pdflatex={_quote_for_shell(self.latex_path)} %O %S",
+      "-jobname=invoice",
+      "-output-directory=" + temp_dir,
+      "-interaction=nonstopmode",
+      latex_file
+    ]
+  
+  def _engine_command(self, temp_dir: str) -> List[str]:
+    """
+    Build a single direct engine pass that reads the source from stdin.
+    
+    Used when latexmk is unavailable. -jobname keeps the output names
+    deterministic; scrollmode is needed because nonstopmode aborts as soon
+    as TeX asks the terminal (stdin) for the next line of the document.
+    """
+    return [
+      self.latex_path,
+      "-interaction=scrollmode",
+      "-jobname=invoice",
+      "-output-directory=" + temp_dir
+    ]
+  
+  def _run_latex_compilation(self, temp_dir: str, latex_content: str) -> Tuple[bool, str]:
+    """Run the actual LaTeX compilation process."""
+    pdf_file = os.path.join(temp_dir, "invoice.pdf")
+    
+    try:
+      if _command_available("latexmk"):
+        latex_file = self._write_source(temp_dir, latex_content)
+        cmd = self._latexmk_command(temp_dir, latex_file)
+        stdin_data = None
+      else:
+        # No latexmk available; pipe the source straight into the engine
+        logger.info(f"latexmk not found, running {self.latex_command} directly")
+        cmd = self._engine_command(temp_dir)
+        stdin_data = latex_content.encode('utf-8')
+      
+      stdout, stderr = self._run_process(cmd, temp_dir, stdin_data, timeout=60)
       
       # Check if PDF was created
-      pdf_file = os.path.join(temp_dir, "invoice.pdf")
       if os.path.exists(pdf_file):
         return True, "Compilation successful"
       
-      # If first pass failed, try second pass for references
-      if result.returncode != 0:
-        logger.warning(f"First LaTeX pass failed: {result.stderr}")
-        
-        # Second pass
-        result2 = subprocess.run(
-          cmd,
-          cwd=temp_dir,
-          capture_output=True,
-          text=True,
-          timeout=60
-        )
-        
-        if os.path.exists(pdf_file):
-          return True, "Compilation successful (second pass)"
-        else:
-          return False, f"LaTeX compilation failed: {result2.stderr}"
-      
-      return False, f"LaTeX compilation failed: {result.stderr}"
+      return False, f"LaTeX compilation failed: {summarize_latex_output(stdout, stderr)}"
     
     except subprocess.TimeoutExpired:
       return False, "LaTeX compilation timed out"
@@ -125,6 +363,73 @@ class PDFCompiler:
     except Exception as e:
       return False, f"Compilation error: {str(e)}"
   
+  def _run_process(self, cmd: List[str], cwd: str, stdin_data: Optional[bytes],
+                   timeout: float) -> Tuple[bytes, bytes]:
+    """
+    Run cmd, feeding stdin_data and collecting stdout/stderr.
+    
+    subprocess.run writes stdin and drains both pipes concurrently, and
+    kills the process if it times out, so a chatty or stuck LaTeX run
+    never blocks on a full pipe or outlives the call.
+    
+    Returns:
+      Tuple of (stdout, stderr) bytes
+    
+    Raises:
+      subprocess.TimeoutExpired: If the process runs longer than timeout
+    """
+    result = subprocess.run(
+      cmd,
+      cwd=cwd,
+      input=stdin_data,
+      stdin=None if stdin_data is not None else subprocess.DEVNULL,
+      capture_output=True,
+      timeout=timeout,
+      close_fds=False
+    )
+    return result.stdout, result.stderr
+  
+  async def _run_latex_compilation_async(self, temp_dir: str, latex_content: str) -> Tuple[bool, str]:
+    """Run the LaTeX compilation process as an asyncio subprocess."""
+    pdf_file = os.path.join(temp_dir, "invoice.pdf")
+    
+    try:
+      if _command_available("latexmk"):
+        latex_file = self._write_source(temp_dir, latex_content)
+        cmd = self._latexmk_command(temp_dir, latex_file)
+        stdin_data = None
+      else:
+        # No latexmk available; pipe the source straight into the engine
+        logger.info(f"latexmk not found, running {self.latex_command} directly")
+        cmd = self._engine_command(temp_dir)
+        stdin_data = latex_content.encode('utf-8')
+      
+      proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        cwd=temp_dir,
+        stdin=asyncio.subprocess.PIPE if stdin_data is not None else asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+      )
+      
+      try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(stdin_data), timeout=60)
+      except asyncio.TimeoutError:
+        proc.kill()
+        await proc.communicate()
+        return False, "LaTeX compilation timed out"
+      
+      # Check if PDF was created
+      if os.path.exists(pdf_file):
+        return True, "Compilation successful"
+      
+      return False, f"LaTeX compilation failed: {summarize_latex_output(stdout, stderr)}"
+    
+    except FileNotFoundError:
+      return False, f"LaTeX command '{self.latex_command}' not found. Please install a LaTeX distribution."
+    except Exception as e:
+      return False, f"Compilation error: {str(e)}"
+  
   def cleanup(self) -> None:
     """Clean up temporary files."""
     for temp_dir in self.temp_files:
@@ -133,6 +438,9 @@ class PDFCompiler:
           shutil.rmtree(temp_dir)
       except Exception as e:
         logger.warning(f"Failed to clean up {temp_dir}: {e}")
+      
+      if temp_dir == self.working_dir:
+        self.working_dir = None
     
     self.temp_files.clear()
   
@@ -149,34 +457,45 @@ class LaTeXEnvironmentChecker:
       "pdflatex",
       "xelatex"
     ]
+    # Drivers are reported when present but can't compile anything alone
+    self.optional_drivers = [
+      "latexmk"
+    ]
+    self._checked: Optional[Tuple[bool, List[str]]] = None
   
   def check_latex_installation(self) -> Tuple[bool, List[str]]:
     """
     Check if LaTeX is properly installed.
     
+    A successful result is remembered, so repeated checks don't spawn
+    the version probes again.
+    
     Returns:
       Tuple of (is_available: bool, available_commands: List[str])
     """
+    if self._checked is not None:
+      return self._checked[0], list(self._checked[1])
+    
     available_commands = []
     
     for command in self.required_packages:
       if self._check_command_available(command):
         available_commands.append(command)
     
-    return len(available_commands) > 0, available_commands
+    is_available = len(available_commands) > 0
+    
+    for command in self.optional_drivers:
+      if self._check_command_available(command):
+        available_commands.append(command)
+    
+    if is_available:
+      self._checked = (is_available, list(available_commands))
+    
+    return is_available, available_commands
   
   def _check_command_available(self, command: str) -> bool:
     """Check if a command is available in PATH."""
-    try:
-      result = subprocess.run(
-        [command, "--version"],
-        capture_output=True,
-        text=True,
-        timeout=10
-      )
-      return result.returncode == 0
-    except (subprocess.TimeoutExpired, FileNotFoundError):
-      return False
+    return _command_available(command)
   
   def get_installation_instructions(self) -> str:
     """Get installation instructions for LaTeX."""
@@ -236,14 +555,7 @@ class PDFGenerator:
     Raises:
       CompilationError: If compilation fails
     """
-    # Check LaTeX environment
-    is_available, available_commands = self.environment_checker.check_latex_installation()
-    
-    if not is_available:
-      instructions = self.environment_checker.get_installation_instructions()
-      raise CompilationError(
-        f"No LaTeX installation found. Available commands: {available_commands}\n{instructions}"
-      )
+    self._check_environment()
     
     # Compile LaTeX to PDF
     success, message = self.compiler.compile_latex(latex_content, output_path)
@@ -253,6 +565,63 @@ class PDFGenerator:
     
     return output_path
   
+  async def generate_pdf_async(self, latex_content: str, output_path: str) -> str:
+    """
+    Generate PDF from LaTeX content, awaiting the LaTeX subprocess.
+    
+    Args:
+      latex_content: LaTeX source code
+      output_path: Output PDF file path
+    
+    Returns:
+      Path to generated PDF file
+    
+    Raises:
+      CompilationError: If compilation fails
+    """
+    self._check_environment()
+    
+    # Compile LaTeX to PDF
+    success, message = await self.compiler.compile_latex_async(latex_content, output_path)
+    
+    if not success:
+      raise CompilationError(message)
+    
+    return output_path
+  
+  def generate_batch(self, latex_documents: List[str], output_paths: List[str]) -> List[str]:
+    """
+    Generate several PDFs with a single LaTeX run.
+    
+    Args:
+      latex_documents: LaTeX source of each invoice
+      output_paths: Output PDF file path of each invoice
+    
+    Returns:
+      Paths to the generated PDF files
+    
+    Raises:
+      CompilationError: If compilation fails
+    """
+    self._check_environment()
+    
+    success, message = self.compiler.compile_batch(latex_documents, output_paths)
+    
+    if not success:
+      raise CompilationError(message)
+    
+    return list(output_paths)
+  
+  def _check_environment(self) -> None:
+    """Raise CompilationError if no LaTeX installation is available."""
+    is_available, available_commands = self.environment_checker.check_latex_installation()
+    
+    if not is_available:
+      instructions = self.environment_checker.get_installation_instructions()
+      raise CompilationError(
+        f"No LaTeX installation found. Available commands: {available_commands}\n{instructions}"
+      )
+  
   def generate_pdf_from_file(self, latex_file: str, output_path: str) -> str:
     """
     Generate PDF from LaTeX file.
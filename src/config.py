@@ -5,13 +5,34 @@ Handles loading and validation of configuration files for
 invoice generation settings, client information, and rates.
 """
 
-import yaml
+import copy
+import functools
 import os
-from pathlib import Path
+import sys
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass, field
 
-from .models import Address, Client, Biller
+from .models import Address
+
+
+@functools.lru_cache(maxsize=None)
+def _yaml():
+  """
+  Import PyYAML on first use.
+
+  A cached configuration never needs it, so the import is deferred until
+  a file is actually parsed or written.
+
+  Returns:
+    Tuple of (yaml module, safe Loader, safe Dumper), using libyaml's C
+    implementations when PyYAML was built with them
+  """
+  import yaml
+  try:
+    from yaml import CSafeLoader as loader, CSafeDumper as dumper
+  except ImportError:
+    from yaml import SafeLoader as loader, SafeDumper as dumper
+  return yaml, loader, dumper
 
 
 @dataclass
@@ -63,6 +84,54 @@ class InvoiceConfig:
       )
 
 
+# Hourly rates written to a freshly created configuration
+_DEFAULT_HOURLY_RATES = {
+  "default": 150.0,
+  "development": 150.0,
+  "programming": 150.0,
+  "coding": 150.0,
+  "consulting": 200.0,
+  "testing": 100.0,
+  "qa": 100.0,
+  "documentation": 120.0,
+  "docs": 120.0,
+  "design": 180.0,
+  "ui": 180.0,
+  "ux": 180.0,
+  "research": 160.0,
+  "planning": 140.0,
+  "meeting": 140.0,
+  "review": 130.0,
+  "debugging": 140.0,
+  "bugfix": 140.0,
+  "maintenance": 130.0,
+  "support": 120.0,
+  "training": 180.0,
+  "general": 150.0
+}
+
+
+# Sentinel for dict lookups where None could be a stored value
+_MISSING = object()
+
+
+def _intern_keys(mapping: Dict[str, Any]) -> Dict[str, Any]:
+  """Return mapping with interned string keys for identity-fast lookups."""
+  return {sys.intern(key) if isinstance(key, str) else key: value
+          for key, value in mapping.items()}
+
+
+# Parsed configurations keyed by (absolute path, mtime_ns, size) so repeated
+# loads of an unchanged file skip YAML parsing entirely.
+_CONFIG_CACHE: Dict[tuple, InvoiceConfig] = {}
+_CONFIG_CACHE_STATS = {'hits': 0, 'misses': 0}
+
+
+def config_cache_info() -> Dict[str, int]:
+  """Return hit/miss counts and the current size of the parsed-config cache."""
+  return dict(_CONFIG_CACHE_STATS, size=len(_CONFIG_CACHE))
+
+
 class ConfigManager:
   """Manages configuration loading, validation, and access."""
 
@@ -76,34 +145,59 @@ class ConfigManager:
     self.config_path = config_path or "config/default.yaml"
     self.config = None
 
-  def load_config(self, config_path: Optional[str] = None) -> InvoiceConfig:
+  def load_config(self, config_path: Optional[str] = None,
+                  use_cache: bool = True) -> InvoiceConfig:
     """
     Load configuration from YAML file.
 
+    Parsed configurations are cached per file and reused until the
+    file's modification time or size changes. Each call gets its own
+    copy, so changes made through one manager don't leak into others.
+
     Args:
       config_path: Optional path to config file
+      use_cache: Reuse (and store) a parsed configuration if the file is unchanged
 
     Returns:
       InvoiceConfig object
     """
     path = config_path or self.config_path
 
-    if not os.path.exists(path):
+    # One stat both checks that the file exists and keys the cache
+    try:
+      st = os.stat(path)
+    except FileNotFoundError:
       # Try to load from config/default.yaml if it exists
       default_path = "config/default.yaml"
-      if os.path.exists(default_path):
-        path = default_path
-      else:
+      try:
+        st = os.stat(default_path)
+      except FileNotFoundError:
         # Create minimal default configuration
         config = self._create_default_config()
         self.save_config(config, path)
+        self.config = config
         return config
-
+      path = default_path
+
+    abs_path = os.path.abspath(path)
+    cache_key = (abs_path, st.st_mtime_ns, st.st_size)
+    if use_cache and cache_key in _CONFIG_CACHE:
+      _CONFIG_CACHE_STATS['hits'] += 1
+      self.config = copy.deepcopy(_CONFIG_CACHE[cache_key])
+      return self.config
+    _CONFIG_CACHE_STATS['misses'] += 1
+
+    # Only a file that is actually parsed needs PyYAML
+    yaml, loader, _ = _yaml()
     try:
       with open(path, 'r', encoding='utf-8') as f:
-        data = yaml.safe_load(f)
+        # Key the cache on the file that was actually read
+        st = os.fstat(f.fileno())
+        data = yaml.load(f, Loader=loader)
 
       config = self._parse_config_data(data)
+      if use_cache:
+        _CONFIG_CACHE[(abs_path, st.st_mtime_ns, st.st_size)] = copy.deepcopy(config)
       self.config = config
       return config
 
@@ -129,8 +223,9 @@ class ConfigManager:
     data = self._config_to_dict(config)
 
     try:
+      yaml, _, dumper = _yaml()
       with open(path, 'w', encoding='utf-8') as f:
-        yaml.dump(data, f, default_flow_style=False, indent=2)
+        yaml.dump(data, f, Dumper=dumper, default_flow_style=False, indent=2)
     except Exception as e:
       raise ValueError(f"Error saving configuration: {e}")
 
@@ -139,32 +234,9 @@ class ConfigManager:
     config = InvoiceConfig()
     
     # Set up minimal default rates
-    config.hourly_rates = {
-      "default": 150.0,
-      "development": 150.0,
-      "programming": 150.0,
-      "coding": 150.0,
-      "consulting": 200.0,
-      "testing": 100.0,
-      "qa": 100.0,
-      "documentation": 120.0,
-      "docs": 120.0,
-      "design": 180.0,
-      "ui": 180.0,
-      "ux": 180.0,
-      "research": 160.0,
-      "planning": 140.0,
-      "meeting": 140.0,
-      "review": 130.0,
-      "debugging": 140.0,
-      "bugfix": 140.0,
-      "maintenance": 130.0,
-      "support": 120.0,
-      "training": 180.0,
-      "general": 150.0
-    }
+    config.hourly_rates = _DEFAULT_HOURLY_RATES.copy()
     
-    config.default_hourly_rate = 150.0
+    config.default_hourly_rate = _DEFAULT_HOURLY_RATES["default"]
     
     return config
 
@@ -214,11 +286,14 @@ class ConfigManager:
 
     # Parse clients
     if 'clients' in data:
-      config.clients = data['clients']
+      config.clients = _intern_keys(data['clients'])
+      for client_data in config.clients.values():
+        if isinstance(client_data, dict) and isinstance(client_data.get('rates'), dict):
+          client_data['rates'] = _intern_keys(client_data['rates'])
 
     # Parse hourly rates
     if 'hourly_rates' in data:
-      config.hourly_rates = data['hourly_rates']
+      config.hourly_rates = _intern_keys(data['hourly_rates'])
       config.default_hourly_rate = config.hourly_rates.get('default', config.default_hourly_rate)
 
     # Parse output settings
@@ -299,20 +374,18 @@ class ConfigManager:
 
     # Get client data
     client_data = self.config.clients.get(client_id)
-    if not client_data:
-      # Client not found, use global task rate
-      return self.get_hourly_rate(task)
-
-    # Check for client-specific rates
-    client_rates = client_data.get('rates', {})
-    if task in client_rates:
-      return client_rates[task]
-
-    # Check for client default rate
-    if 'default' in client_rates:
-      return client_rates['default']
-
-    # Fall back to global task rate
+    if client_data:
+      # Check for client-specific rates, then the client default rate,
+      # with one dict probe each
+      client_rates = client_data.get('rates') or {}
+      rate = client_rates.get(task, _MISSING)
+      if rate is not _MISSING:
+        return rate
+      rate = client_rates.get('default', _MISSING)
+      if rate is not _MISSING:
+        return rate
+
+    # Client not found or no client rate; fall back to global task rate
     return self.get_hourly_rate(task)
 
   def get_client_rates(self, client_id: str) -> Dict[str, float]:
@@ -361,10 +434,11 @@ class ConfigManager:
       errors.append("Default hourly rate must be greater than 0")
 
     # Validate clients
-    for client_id, client_data in config.clients.items():
-      if not client_data.get('name'):
-        errors.append(f"Client '{client_id}' name is required")
-      if not client_data.get('prefix'):
-        errors.append(f"Client '{client_id}' prefix is required")
+    errors.extend(
+      f"Client '{client_id}' {required} is required"
+      for client_id, client_data in config.clients.items()
+      for required in ('name', 'prefix')
+      if not client_data.get(required)
+    )
 
     return errors
@@ -5,11 +5,141 @@ Generates LaTeX source code from invoice data and applies
 professional formatting for PDF invoices.
 """
 
-from typing import Optional
+import functools
+import math
+from datetime import date
+from typing import Optional, Tuple
 
 from .models import Invoice, Address
 
 
+# LaTeX special characters and their escaped forms, applied in a single
+# str.translate pass (so replacements are never escaped a second time)
+_LATEX_ESCAPES = str.maketrans({
+  '\\': r'\textbackslash{}',
+  '{': r'\{',
+  '}': r'\}',
+  '$': r'\$',
+  '&': r'\&',
+  '%': r'\%',
+  '#': r'\#',
+  '^': r'\^{}',
+  '_': r'\_',
+  '~': r'\textasciitilde{}'
+})
+
+# Document preamble shared by every invoice
+_PREAMBLE = r"""\documentclass[12pt]{article}
+\usepackage{fancyhdr}
+\usepackage{geometry}
+\usepackage{graphicx}
+\usepackage{xcolor}
+\usepackage{enumitem}
+\usepackage{hyperref}
+\usepackage{tabularx}
+\usepackage{fontspec}
+
+% Custom hyperlink styling
+\hypersetup{
+  colorlinks=false,
+  urlcolor=black,
+  linkcolor=black,
+  citecolor=black,
+  filecolor=black,
+  pdfborder={0 0 0},
+  urlbordercolor={0 0 0},
+  linkbordercolor={0 0 0},
+  citebordercolor={0 0 0},
+  filebordercolor={0 0 0}
+}
+
+% Custom underline command for hyperlinks
+\newcommand{\ulink}[2]{\underline{\href{#1}{\monofont #2}}}
+
+% Custom bullet for itemize
+\renewcommand{\labelitemi}{\monofont ›}
+
+% Custom font setup
+\setmainfont{GT-Maru-VF}[
+  Path = /Users/matter/fonts/maru vf/,
+  Extension = .ttf,
+  UprightFont = *,
+  BoldFont = *,
+  ItalicFont = *,
+  BoldItalicFont = *
+]
+
+\newfontfamily{\monofont}{GT-Maru-Mono-VF}[
+  Path = /Users/matter/fonts/maru vf/,
+  Extension = .ttf
+]
+
+% Page setup
+\geometry{margin=0.8in, top=1.75in, right=1.0in}
+\pagestyle{fancy}
+\fancyhf{}
+\renewcommand{\headrulewidth}{0.4pt}
+\setlength{\headheight}{1.5cm}
+\setlength{\headsep}{1cm}
+"""
+
+# Invoice-specific header and opening of the document body, filled in with
+# str.format (literal LaTeX braces are doubled)
+_HEADER_TEMPLATE = r"""
+% Custom header with invoice info
+\fancyhead[L]{{
+    \begin{{tabular}}{{ll}}
+        \textbf{{invoice \#}} & {invoice_number} \\
+        \textbf{{date}} & {issue_date} \\
+        \textbf{{due date}} & {due_date} \\
+    \end{{tabular}}
+}}
+\fancyhead[R]{{
+    \begin{{tabular}}{{rl}}
+        \textbf{{total}} & \${total} \\
+        \textbf{{status}} & pending \\
+    \end{{tabular}}
+}}
+
+\begin{{document}}
+
+% Invoice header
+\begin{{minipage}}{{0.6\textwidth}}
+\textbf{{{biller_name}}}\\
+{biller_address}
+
+{biller_contact}
+\end{{minipage}}
+\hfill
+\begin{{minipage}}{{0.35\textwidth}}
+\textbf{{{client_name}}}\\
+{client_address}
+
+{client_contact}
+\end{{minipage}}
+
+\vspace{{1.5cm}}
+
+% Project title
+\Large\textbf{{services provided}}\normalsize
+
+% Date range subtitle
+\vspace{{0.2cm}}
+\small\textbf{{{period_start}—{period_end}}}\normalsize
+
+\vspace{{0.8cm}}"""
+
+
+_LATEX_FOOTER = r"""
+\end{document}"""
+
+
+@functools.lru_cache(maxsize=1024)
+def _format_date(value: date, fmt: str) -> str:
+  """strftime, memoized: a batch repeats the same issue and due dates."""
+  return value.strftime(fmt)
+
+
 class LaTeXInvoiceGenerator:
   """Generates LaTeX source code from Invoice objects."""
 
@@ -38,23 +168,31 @@ class LaTeXInvoiceGenerator:
     # Generate LaTeX using the invoice package
     latex_parts = []
 
+    # Totals are computed once and shared by the header and the table
+    totals = self._calculate_totals(invoice)
+
     # Header
-    latex_parts.append(self._get_latex_header(invoice, start_date, end_date))
+    latex_parts.append(self._get_latex_header(invoice, start_date, end_date, totals))
 
     # Invoice content using invoice package
-    latex_parts.append(self._generate_invoice_content_with_package(invoice))
+    latex_parts.append(self._generate_invoice_content_with_package(invoice, totals))
 
     # Footer
     latex_parts.append(self._get_latex_footer())
 
     return '\n'.join(latex_parts)
 
-  def _get_latex_header(self, invoice: Invoice, start_date: str = None, end_date: str = None) -> str:
+  def _calculate_totals(self, invoice: Invoice) -> Tuple[float, float, float]:
+    """Return (subtotal, tax_amount, total), reusing the invoice's subtotal."""
+    subtotal = invoice.subtotal or math.fsum(item.amount for item in invoice.billable_items)
+    tax_amount = subtotal * invoice.tax_rate if invoice.tax_rate > 0 else 0
+    return subtotal, tax_amount, subtotal + tax_amount
+
+  def _get_latex_header(self, invoice: Invoice, start_date: str = None, end_date: str = None,
+                        totals: Optional[Tuple[float, float, float]] = None) -> str:
     """Generate LaTeX document header using fancyhdr approach."""
     # Calculate totals for header
-    subtotal = sum(item.amount for item in invoice.billable_items)
-    tax_amount = subtotal * invoice.tax_rate if invoice.tax_rate > 0 else 0
-    total = subtotal + tax_amount
+    _, _, total = totals or self._calculate_totals(invoice)
 
     # Format addresses
     biller_address = self._format_address(invoice.biller.address)
@@ -73,130 +211,52 @@ class LaTeXInvoiceGenerator:
     if invoice.client.contact_phone:
       client_contact_lines.append(f"{invoice.client.contact_phone}")
 
-    return f"""\\documentclass[12pt]{{article}}
-\\usepackage{{fancyhdr}}
-\\usepackage{{geometry}}
-\\usepackage{{graphicx}}
-\\usepackage{{xcolor}}
-\\usepackage{{enumitem}}
-\\usepackage{{hyperref}}
-\\usepackage{{tabularx}}
-\\usepackage{{fontspec}}
-
-% Custom hyperlink styling
-\\hypersetup{{
-  colorlinks=false,
-  urlcolor=black,
-  linkcolor=black,
-  citecolor=black,
-  filecolor=black,
-  pdfborder={{0 0 0}},
-  urlbordercolor={{0 0 0}},
-  linkbordercolor={{0 0 0}},
-  citebordercolor={{0 0 0}},
-  filebordercolor={{0 0 0}}
-}}
-
-% Custom underline command for hyperlinks
-\\newcommand{{\\ulink}}[2]{{\\underline{{\\href{{#1}}{{\\monofont #2}}}}}}
-
-% Custom bullet for itemize
-\\renewcommand{{\\labelitemi}}{{\\monofont ›}}
-
-% Custom font setup
-\\setmainfont{{GT-Maru-VF}}[
-  Path = /Users/matter/fonts/maru vf/,
-  Extension = .ttf,
-  UprightFont = *,
-  BoldFont = *,
-  ItalicFont = *,
-  BoldItalicFont = *
-]
-
-\\newfontfamily{{\\monofont}}{{GT-Maru-Mono-VF}}[
-  Path = /Users/matter/fonts/maru vf/,
-  Extension = .ttf
-]
-
-% Page setup
-\\geometry{{margin=0.8in, top=1.75in, right=1.0in}}
-\\pagestyle{{fancy}}
-\\fancyhf{{}}
-\\renewcommand{{\\headrulewidth}}{{0.4pt}}
-\\setlength{{\\headheight}}{{1.5cm}}
-\\setlength{{\\headsep}}{{1cm}}
-
-% Custom header with invoice info
-\\fancyhead[L]{{
-    \\begin{{tabular}}{{ll}}
-        \\textbf{{invoice \\#}} & {invoice.invoice_number} \\\\
-        \\textbf{{date}} & {invoice.issue_date.strftime('%B %d, %Y')} \\\\
-        \\textbf{{due date}} & {invoice.due_date.strftime('%B %d, %Y')} \\\\
-    \\end{{tabular}}
-}}
-\\fancyhead[R]{{
-    \\begin{{tabular}}{{rl}}
-        \\textbf{{total}} & \\${total:.2f} \\\\
-        \\textbf{{status}} & pending \\\\
-    \\end{{tabular}}
-}}
-
-\\begin{{document}}
-
-% Invoice header
-\\begin{{minipage}}{{0.6\\textwidth}}
-\\textbf{{{invoice.biller.name}}}\\\\
-{biller_address.replace('\\\\', ' \\\\ ')}
-
-{chr(10).join(biller_contact_lines).replace(chr(10), ' \\\\ ')}
-\\end{{minipage}}
-\\hfill
-\\begin{{minipage}}{{0.35\\textwidth}}
-\\textbf{{{invoice.client.name}}}\\\\
-{client_address.replace('\\\\', ' \\\\ ')}
-
-{chr(10).join(client_contact_lines).replace(chr(10), ' \\\\ ')}
-\\end{{minipage}}
-
-\\vspace{{1.5cm}}
-
-% Project title
-\\Large\\textbf{{services provided}}\\normalsize
-
-% Date range subtitle
-\\vspace{{0.2cm}}
-\\small\\textbf{{{start_date.replace('-', '') if start_date else ''}—{end_date.replace('-', '') if end_date else ''}}}\\normalsize
-
-\\vspace{{0.8cm}}"""
-
-    return header_section
-
-  def _generate_invoice_content_with_package(self, invoice: Invoice) -> str:
+    # Only the invoice-specific part is rendered; the preamble is constant
+    return _PREAMBLE + _HEADER_TEMPLATE.format(
+      invoice_number=invoice.invoice_number,
+      issue_date=_format_date(invoice.issue_date, '%B %d, %Y'),
+      due_date=_format_date(invoice.due_date, '%B %d, %Y'),
+      total=f"{total:.2f}",
+      biller_name=invoice.biller.name,
+      biller_address=biller_address.replace('\\\\', ' \\\\ '),
+      biller_contact=' \\\\ '.join(biller_contact_lines),
+      client_name=invoice.client.name,
+      client_address=client_address.replace('\\\\', ' \\\\ '),
+      client_contact=' \\\\ '.join(client_contact_lines),
+      period_start=start_date.replace('-', '') if start_date else '',
+      period_end=end_date.replace('-', '') if end_date else ''
+    )
+
+  def _generate_invoice_content_with_package(self, invoice: Invoice,
+                                             totals: Optional[Tuple[float, float, float]] = None) -> str:
     """Generate invoice content using fancyhdr header approach."""
     # Calculate totals
-    subtotal = sum(item.amount for item in invoice.billable_items)
-    tax_amount = subtotal * invoice.tax_rate if invoice.tax_rate > 0 else 0
-    total = subtotal + tax_amount
+    subtotal, tax_amount, total = totals or self._calculate_totals(invoice)
 
-    # Generate line items table
-    table_section = f"""
+    # Generate line items table; rows are collected and joined once
+    rows = [f"""
 % Line items table
 \\begin{{tabularx}}{{\\textwidth}}{{lXrrrr}}
 {{\\monofont \\textbf{{type}}}} & {{\\monofont \\textbf{{notes}}}} & {{\\monofont \\textbf{{rate}}}} & {{\\monofont \\textbf{{qty}}}} & {{\\monofont \\textbf{{units}}}} & {{\\monofont \\textbf{{price (USD)}}}} \\\\
-"""
-
-    # Generate line items
-    for item in invoice.billable_items:
-      table_section += f"{{\\monofont service}} & {{\\monofont {self._escape_latex(item.description)}}} & {{\\monofont \\${item.hourly_rate:.2f}}} & {{\\monofont {item.hours_worked:.2f}}} & {{\\monofont hours}} & {{\\monofont \\${item.amount:.2f}}} \\\\\n"
+"""]
+
+    # Generate line items (an inlined list comprehension; the f-string row
+    # is compiled once and formats faster than an equivalent str.format)
+    escape = self._escape_latex
+    rows += [
+      f"{{\\monofont service}} & {{\\monofont {escape(item.description)}}} & {{\\monofont \\${item.hourly_rate:.2f}}} & {{\\monofont {item.hours_worked:.2f}}} & {{\\monofont hours}} & {{\\monofont \\${item.amount:.2f}}} \\\\\n"
+      for item in invoice.billable_items
+    ]
 
     # Add totals
-    table_section += f"{{\\monofont \\textbf{{subtotal}}}} & & & & & {{\\monofont \\${subtotal:.2f}}} \\\\\n"
+    rows.append(f"{{\\monofont \\textbf{{subtotal}}}} & & & & & {{\\monofont \\${subtotal:.2f}}} \\\\\n")
 
     if invoice.tax_rate > 0:
-      table_section += f"{{\\monofont \\textbf{{Tax ({invoice.tax_rate * 100:.0f}\\%)}}}} & & & & & {{\\monofont \\${tax_amount:.2f}}} \\\\\n"
+      rows.append(f"{{\\monofont \\textbf{{Tax ({invoice.tax_rate * 100:.0f}\\%)}}}} & & & & & {{\\monofont \\${tax_amount:.2f}}} \\\\\n")
 
-    table_section += f"{{\\monofont \\textbf{{total}}}} & & & & & {{\\monofont \\textbf{{\\${total:.2f}}}}} \\\\\n"
-    table_section += f"\\end{{tabularx}}\n"
+    rows.append(f"{{\\monofont \\textbf{{total}}}} & & & & & {{\\monofont \\textbf{{\\${total:.2f}}}}} \\\\\n")
+    rows.append("\\end{tabularx}\n")
+    table_section = ''.join(rows)
 
     # Generate payment section
     payment_section = f"""
@@ -216,8 +276,7 @@ class LaTeXInvoiceGenerator:
 
   def _get_latex_footer(self) -> str:
     """Generate LaTeX document footer using Amy Fare template style."""
-    return r"""
-\end{document}"""
+    return _LATEX_FOOTER
 
   def _format_address(self, address: Address) -> str:
     """Format address for LaTeX template."""
@@ -239,21 +298,4 @@ class LaTeXInvoiceGenerator:
     if not text:
       return ""
 
-    # LaTeX special characters that need escaping
-    replacements = {
-      '\\': r'\textbackslash{}',
-      '{': r'\{',
-      '}': r'\}',
-      '$': r'\$',
-      '&': r'\&',
-      '%': r'\%',
-      '#': r'\#',
-      '^': r'\^{}',
-      '_': r'\_',
-      '~': r'\textasciitilde{}'
-    }
-
-    for old, new in replacements.items():
-      text = text.replace(old, new)
-
-    return text
+    return text.translate(_LATEX_ESCAPES)
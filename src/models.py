@@ -5,14 +5,15 @@ Defines the core data structures for invoices, clients, and billable items.
 Includes the invoice numbering system using hex hashes.
 """
 
+import functools
 import hashlib
-from datetime import datetime, date
-from typing import List, Dict, Optional
-from dataclasses import dataclass, field
-from decimal import Decimal, ROUND_HALF_UP
+import math
+from datetime import datetime, date, timedelta
+from typing import Iterator, List, Optional
+from dataclasses import dataclass, field, InitVar
 
 
-@dataclass
+@dataclass(slots=True)
 class Address:
   """Represents a physical address."""
   street: str
@@ -25,7 +26,7 @@ class Address:
     return f"{self.street}\n{self.city}, {self.state} {self.zip_code}\n{self.country}"
 
 
-@dataclass
+@dataclass(slots=True)
 class Client:
   """Represents a client for invoicing."""
   name: str
@@ -36,7 +37,7 @@ class Client:
   prefix: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Biller:
   """Represents the biller (John Matter)."""
   name: str = "John Matter"
@@ -47,7 +48,7 @@ class Biller:
   website: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class BillableItem:
   """Represents a billable line item for an invoice."""
   description: str
@@ -63,7 +64,7 @@ class BillableItem:
       self.amount = self.hours_worked * self.hourly_rate
 
 
-@dataclass
+@dataclass(slots=True)
 class Invoice:
   """Represents a complete invoice."""
   invoice_number: str
@@ -80,17 +81,38 @@ class Invoice:
   payment_instructions: str = ""
   notes: str = ""
   terms_and_conditions: str = ""
+  validate: InitVar[bool] = False
   
-  def __post_init__(self):
-    """Calculate totals if not provided."""
+  def __post_init__(self, validate: bool):
+    """
+    Calculate totals if not provided.
+    
+    With validate=True, raises InvoiceValidationError on the first
+    validation error instead of leaving the check to InvoiceValidator.
+    """
+    # Totals computed here are consistent by construction and need no check
+    totals_given = bool(self.subtotal or self.tax_amount or self.total_amount)
+    
     if self.subtotal == 0:
-      self.subtotal = sum(item.amount for item in self.billable_items)
+      self.subtotal = InvoiceCalculator.calculate_subtotal(self.billable_items)
     
     if self.tax_amount == 0 and self.tax_rate > 0:
       self.tax_amount = self.subtotal * self.tax_rate
     
     if self.total_amount == 0:
       self.total_amount = self.subtotal + self.tax_amount
+    
+    if validate:
+      error = next(InvoiceValidator.iter_errors(self, check_totals=totals_given), None)
+      if error:
+        raise InvoiceValidationError([error])
+
+
+@functools.lru_cache(maxsize=4096)
+def _sha256_prefix(data: str, length: int) -> str:
+  """Return the first length hex characters of data's SHA-256 hash (memoized)."""
+  # Hex-encode only the digest bytes that are needed
+  return hashlib.sha256(data.encode('utf-8')).digest()[:(length + 1) // 2].hex()[:length]
 
 
 class InvoiceNumberGenerator:
@@ -148,8 +170,7 @@ class InvoiceNumberGenerator:
   
   def _generate_hash(self, data_string: str) -> str:
     """Generate SHA-256 hash and return first N characters."""
-    hash_object = hashlib.sha256(data_string.encode('utf-8'))
-    return hash_object.hexdigest()[:self.hash_length]
+    return _sha256_prefix(data_string, self.hash_length)
   
   def verify_invoice_number(self, invoice_number: str, client_prefix: str,
                           start_date: str, end_date: str, total_hours: float,
@@ -175,27 +196,44 @@ class InvoiceNumberGenerator:
     return invoice_number == expected_number
 
 
+# Days until payment is due, keyed by lower-cased payment terms
+PAYMENT_TERM_DAYS = {
+  "net 30": 30,
+  "net 15": 15,
+  "due on receipt": 0
+}
+
+
+def _round_cents(amount: float) -> float:
+  """Round to 2 decimal places, halves away from zero."""
+  # The tiny offset absorbs binary representation error, so 1.005 rounds
+  # up like its decimal value does
+  cents = math.floor(abs(amount) * 100 + 0.5 + 1e-7)
+  return math.copysign(cents / 100, amount)
+
+
 class InvoiceCalculator:
   """Handles invoice calculations and financial summaries."""
   
   @staticmethod
   def calculate_subtotal(billable_items: List[BillableItem]) -> float:
     """Calculate invoice subtotal."""
-    return sum(item.amount for item in billable_items)
+    # fsum tracks the exact sum, so many line items can't drift by a cent
+    return math.fsum(item.amount for item in billable_items)
   
   @staticmethod
   def calculate_tax(subtotal: float, tax_rate: float) -> float:
     """Calculate tax amount."""
     tax_amount = subtotal * tax_rate
     # Round to 2 decimal places
-    return Decimal(str(tax_amount)).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+    return _round_cents(tax_amount)
   
   @staticmethod
   def calculate_total(subtotal: float, tax_amount: float) -> float:
     """Calculate total amount."""
     total = subtotal + tax_amount
     # Round to 2 decimal places
-    return Decimal(str(total)).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+    return _round_cents(total)
   
   @staticmethod
   def format_currency(amount: float) -> str:
@@ -205,17 +243,17 @@ class InvoiceCalculator:
   @staticmethod
   def calculate_due_date(issue_date: date, payment_terms: str) -> date:
     """Calculate due date based on payment terms."""
-    from datetime import timedelta
-    
-    if payment_terms.lower() == "net 30":
-      return issue_date + timedelta(days=30)
-    elif payment_terms.lower() == "net 15":
-      return issue_date + timedelta(days=15)
-    elif payment_terms.lower() == "due on receipt":
-      return issue_date
-    else:
-      # Default to net 30
-      return issue_date + timedelta(days=30)
+    # Unknown terms default to net 30
+    days = PAYMENT_TERM_DAYS.get(payment_terms.lower(), 30)
+    return issue_date + timedelta(days=days)
+
+
+class InvoiceValidationError(Exception):
+  """Raised when an invoice constructed with validate=True is invalid."""
+  
+  def __init__(self, errors: List[str]):
+    self.errors = errors
+    super().__init__("; ".join(errors))
 
 
 class InvoiceValidator:
@@ -232,35 +270,48 @@ class InvoiceValidator:
     Returns:
       List of validation error messages
     """
-    errors = []
+    return list(InvoiceValidator.iter_errors(invoice))
+  
+  @staticmethod
+  def iter_errors(invoice: Invoice, check_totals: bool = True) -> Iterator[str]:
+    """
+    Yield validation error messages lazily, cheapest checks first.
     
+    Args:
+      invoice: Invoice object to validate
+      check_totals: Whether to recompute and compare the invoice totals
+    
+    Returns:
+      Iterator over validation error messages
+    """
     # Check required fields
     if not invoice.invoice_number:
-      errors.append("Invoice number is required")
+      yield "Invoice number is required"
     
     if not invoice.biller.name:
-      errors.append("Biller name is required")
+      yield "Biller name is required"
     
     if not invoice.client.name:
-      errors.append("Client name is required")
+      yield "Client name is required"
     
     if not invoice.billable_items:
-      errors.append("At least one billable item is required")
+      yield "At least one billable item is required"
+    
+    if not check_totals:
+      return
     
     # Check financial calculations
     calculated_subtotal = InvoiceCalculator.calculate_subtotal(invoice.billable_items)
     if abs(calculated_subtotal - invoice.subtotal) > 0.01:
-      errors.append(f"Subtotal calculation error: expected {calculated_subtotal}, got {invoice.subtotal}")
+      yield f"Subtotal calculation error: expected {calculated_subtotal}, got {invoice.subtotal}"
     
     calculated_tax = InvoiceCalculator.calculate_tax(invoice.subtotal, invoice.tax_rate)
-    if abs(float(calculated_tax) - invoice.tax_amount) > 0.01:
-      errors.append(f"Tax calculation error: expected {calculated_tax}, got {invoice.tax_amount}")
+    if abs(calculated_tax - invoice.tax_amount) > 0.01:
+      yield f"Tax calculation error: expected {calculated_tax}, got {invoice.tax_amount}"
     
     calculated_total = InvoiceCalculator.calculate_total(invoice.subtotal, invoice.tax_amount)
-    if abs(float(calculated_total) - invoice.total_amount) > 0.01:
-      errors.append(f"Total calculation error: expected {calculated_total}, got {invoice.total_amount}")
-    
-    return errors
+    if abs(calculated_total - invoice.total_amount) > 0.01:
+      yield f"Total calculation error: expected {calculated_total}, got {invoice.total_amount}"
   
   @staticmethod
   def validate_billable_item(item: BillableItem) -> List[str]:
@@ -5,25 +5,40 @@ Handles parsing of JSON/CSV output from timew export command,
 extracting time intervals, tags, and project categorization.
 """
 
-import json
 import csv
+import hashlib
+import operator
+import sys
+import threading
+from collections import OrderedDict, defaultdict
 from datetime import datetime
-from typing import List, Dict, Optional, Union
+from itertools import chain
+from typing import BinaryIO, Iterable, Iterator, List, Dict, Optional, Sequence, Union
 from dataclasses import dataclass
 
+try:
+  import orjson as _json
+except ImportError:
+  import json as _json
 
-@dataclass
+try:
+  import ijson
+except ImportError:
+  ijson = None
+
+
+@dataclass(slots=True)
 class TimeEntry:
   """Represents a single time tracking entry from Timewarrior."""
   start: datetime
   end: Optional[datetime]
-  tags: List[str]
+  tags: Sequence[str]  # Tuple of interned strings when parsed from an export
   annotation: Optional[str]
   project: Optional[str]
   duration_seconds: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class BillableItem:
   """Represents a billable line item for an invoice."""
   description: str
@@ -34,23 +49,103 @@ class BillableItem:
   tags: List[str]
 
 
+_get_tags = operator.attrgetter('tags')
+
+
+def _parse_timestamp(value: str) -> datetime:
+  """
+  Parse a Timewarrior timestamp such as 20250703T090000Z.
+  
+  datetime.fromisoformat accepts the basic and extended ISO 8601 forms and
+  the 'Z' suffix directly (Python 3.11+), so no intermediate string is built.
+  'Z' maps to the shared timezone.utc instance, so no tzinfo cache is needed
+  for timew exports, which are always in UTC.
+  """
+  return datetime.fromisoformat(value)
+
+
+def _stream_intervals(stream: BinaryIO) -> Iterator[dict]:
+  """Yield export intervals one at a time with ijson, as ValueError on bad JSON."""
+  try:
+    yield from ijson.items(stream, 'item', use_float=True)
+  except ijson.JSONError as e:
+    raise ValueError(f"Invalid JSON data: {e}") from e
+
+
+def _copy_entries(entries: List[TimeEntry]) -> List[TimeEntry]:
+  """Shallow-copy cached entries so callers can't modify the cached ones."""
+  # The fields themselves (datetimes, tag tuples, strings) are immutable
+  return [
+    TimeEntry(entry.start, entry.end, entry.tags, entry.annotation,
+              entry.project, entry.duration_seconds)
+    for entry in entries
+  ]
+
+
+# Parsed exports keyed by (format, BLAKE2b digest of the payload), most
+# recently used last. Bounded so long-running batch use can't grow unchecked.
+_PARSE_CACHE: "OrderedDict[tuple, List[TimeEntry]]" = OrderedDict()
+_PARSE_CACHE_MAXSIZE = 32
+# Batch generation prepares invoices in worker threads
+_PARSE_CACHE_LOCK = threading.Lock()
+
+_EXPORT_FORMATS = frozenset(('json', 'csv'))
+
+# Tags that identify who the work is for rather than what the task was
+_IDENTIFIER_TAG_PREFIXES = ('project:', 'client:')
+_KNOWN_CLIENT_TAGS = frozenset(('madrona', 'goodhertz', 'uhe'))
+
+
 class TimewarriorParser:
   """Parses Timewarrior export data and converts to billable items."""
   
   def __init__(self):
     self.supported_formats = ['json', 'csv']
   
-  def parse_export_data(self, data: str, format_type: str = 'json') -> List[TimeEntry]:
+  def parse_export_data(self, data: Union[str, bytes], format_type: str = 'json',
+                        use_cache: bool = True) -> List[TimeEntry]:
     """
     Parse Timewarrior export data into TimeEntry objects.
     
+    Identical payloads are served from an LRU cache keyed by a hash of
+    the data, so regenerating an invoice skips reparsing. Each call gets
+    its own copies of the entries.
+    
     Args:
-      data: Raw export data from timew export command
+      data: Raw export data from timew export command (str or UTF-8 bytes)
       format_type: Format of the data ('json' or 'csv')
+      use_cache: Reuse previously parsed entries for identical data
     
     Returns:
       List of TimeEntry objects
     """
+    # Reject unknown formats before hashing or decoding the payload
+    if format_type not in _EXPORT_FORMATS:
+      raise ValueError(f"Unsupported format: {format_type}")
+    
+    if not use_cache:
+      return self._parse(data, format_type)
+    
+    raw = data if isinstance(data, bytes) else data.encode('utf-8')
+    digest = hashlib.blake2b(raw, digest_size=16).hexdigest()
+    key = (format_type, digest)
+    
+    with _PARSE_CACHE_LOCK:
+      entries = _PARSE_CACHE.get(key)
+      if entries is not None:
+        _PARSE_CACHE.move_to_end(key)
+        return _copy_entries(entries)
+    
+    entries = self._parse(data, format_type)
+    with _PARSE_CACHE_LOCK:
+      _PARSE_CACHE[key] = entries
+      if len(_PARSE_CACHE) > _PARSE_CACHE_MAXSIZE:
+        _PARSE_CACHE.popitem(last=False)
+    
+    return _copy_entries(entries)
+  
+  def _parse(self, data: Union[str, bytes], format_type: str) -> List[TimeEntry]:
+    """Dispatch raw export data to the parser for its format."""
     if format_type == 'json':
       return self._parse_json(data)
     elif format_type == 'csv':
@@ -58,52 +153,122 @@ class TimewarriorParser:
     else:
       raise ValueError(f"Unsupported format: {format_type}")
   
-  def _parse_json(self, json_data: str) -> List[TimeEntry]:
+  def _parse_json(self, json_data: Union[str, bytes]) -> List[TimeEntry]:
     """Parse JSON format Timewarrior export data."""
     try:
-      data = json.loads(json_data)
-      entries = []
+      return list(self._iter_json_entries(_json.loads(json_data)))
+    except (_json.JSONDecodeError, UnicodeDecodeError) as e:
+      # orjson reports bad UTF-8 as a JSONDecodeError; the stdlib fallback
+      # raises UnicodeDecodeError while decoding bytes
+      raise ValueError(f"Invalid JSON data: {e}") from e
+  
+  def parse_json_stream(self, stream: BinaryIO) -> Iterator[TimeEntry]:
+    """
+    Lazily parse a JSON export read from a binary file object.
+    
+    With ijson installed the intervals are decoded one at a time, so a
+    long export never has to be held in memory as a whole; otherwise the
+    stream is read and decoded in one go. The entries are not cached.
+    
+    Args:
+      stream: Binary file object with timew export JSON, e.g. a pipe
+    
+    Returns:
+      Iterator of TimeEntry objects, suitable for apply_hourly_rates
+    
+    Raises:
+      ValueError: If the stream is not valid JSON; with ijson this can
+        surface part way through iteration
+    """
+    if ijson is not None:
+      return self._iter_json_entries(_stream_intervals(stream))
+    
+    try:
+      intervals = _json.loads(stream.read())
+    except (_json.JSONDecodeError, UnicodeDecodeError) as e:
+      raise ValueError(f"Invalid JSON data: {e}") from e
+    
+    return self._iter_json_entries(intervals)
+  
+  def _iter_json_entries(self, intervals: Iterable[dict]) -> Iterator[TimeEntry]:
+    """Build TimeEntry objects from decoded JSON export intervals."""
+    previous_raw_end = previous_end = None
+    
+    for interval in intervals:
+      # Back-to-back intervals start exactly when the previous one ended,
+      # so reuse that datetime instead of parsing the same string again
+      raw_start = interval['start']
+      if raw_start is None:
+        raise ValueError(f"Invalid JSON data: interval without a start time: {interval}")
+      start = previous_end if raw_start == previous_raw_end else _parse_timestamp(raw_start)
+      end = None
+      if interval.get('end'):
+        previous_raw_end = interval['end']
+        end = previous_end = _parse_timestamp(previous_raw_end)
+      duration_seconds = int((end - start).total_seconds()) if end else None
       
-      for interval in data:
-        start = datetime.fromisoformat(interval['start'].replace('Z', '+00:00'))
-        end = None
-        if interval.get('end'):
-          end = datetime.fromisoformat(interval['end'].replace('Z', '+00:00'))
-        
-        tags = interval.get('tags', [])
-        annotation = interval.get('annotation')
-        
-        # Extract project from tags or annotation
-        project = self._extract_project(tags, annotation)
-        
-        entry = TimeEntry(
-          start=start,
-          end=end,
-          tags=tags,
-          annotation=annotation,
-          project=project
-        )
-        entries.append(entry)
+      # Tags recur across most intervals; interning shares one string
+      # per distinct tag and lets later comparisons hit the identity check
+      tags = tuple(map(sys.intern, interval.get('tags', ())))
+      annotation = interval.get('annotation')
       
-      return entries
-    except json.JSONDecodeError as e:
-      raise ValueError(f"Invalid JSON data: {e}")
+      # Extract project from tags or annotation
+      project = self._extract_project(tags, annotation)
+      
+      yield TimeEntry(
+        start=start,
+        end=end,
+        tags=tags,
+        annotation=annotation,
+        project=project,
+        duration_seconds=duration_seconds
+      )
   
-  def _parse_csv(self, csv_data: str) -> List[TimeEntry]:
+  def _parse_csv(self, csv_data: Union[str, bytes]) -> List[TimeEntry]:
     """Parse CSV format Timewarrior export data."""
+    if isinstance(csv_data, bytes):
+      csv_data = csv_data.decode('utf-8')
+    
     entries = []
-    reader = csv.DictReader(csv_data.splitlines())
+    reader = csv.reader(csv_data.splitlines())
+    header = next(reader, None)
+    if header is None:
+      return entries
+    
+    # Resolve the columns once and index rows positionally rather than
+    # building a dict per row; absent columns map past the end of any row
+    columns = {name: index for index, name in enumerate(header)}
+    if 'start' not in columns:
+      raise ValueError("Invalid CSV data: missing 'start' column")
+    start_index = columns['start']
+    end_index = columns.get('end', sys.maxsize)
+    tags_index = columns.get('tags', sys.maxsize)
+    annotation_index = columns.get('annotation', sys.maxsize)
+    previous_raw_end = previous_end = None
     
     for row in reader:
-      start = datetime.fromisoformat(row['start'].replace('Z', '+00:00'))
+      if not row:
+        continue
+      row_length = len(row)
+      
+      if start_index >= row_length:
+        raise ValueError(f"Invalid CSV data: row without a start time: {row}")
+      
+      # Reuse the previous end for back-to-back intervals (see _parse_json)
+      raw_start = row[start_index]
+      start = previous_end if raw_start == previous_raw_end else _parse_timestamp(raw_start)
       end = None
-      if row.get('end'):
-        end = datetime.fromisoformat(row['end'].replace('Z', '+00:00'))
+      raw_end = row[end_index] if end_index < row_length else None
+      if raw_end:
+        previous_raw_end = raw_end
+        end = previous_end = _parse_timestamp(raw_end)
+      duration_seconds = int((end - start).total_seconds()) if end else None
       
-      tags = row.get('tags', '').split(',') if row.get('tags') else []
-      tags = [tag.strip() for tag in tags if tag.strip()]
+      raw_tags = row[tags_index] if tags_index < row_length else None
+      tags = raw_tags.split(',') if raw_tags else ()
+      tags = tuple([sys.intern(tag.strip()) for tag in tags if tag.strip()])
       
-      annotation = row.get('annotation')
+      annotation = row[annotation_index] if annotation_index < row_length else None
       project = self._extract_project(tags, annotation)
       
       entry = TimeEntry(
@@ -111,23 +276,30 @@ class TimewarriorParser:
         end=end,
         tags=tags,
         annotation=annotation,
-        project=project
+        project=project,
+        duration_seconds=duration_seconds
       )
       entries.append(entry)
     
     return entries
   
-  def _extract_project(self, tags: List[str], annotation: Optional[str]) -> Optional[str]:
+  def _extract_project(self, tags: Sequence[str], annotation: Optional[str]) -> Optional[str]:
     """Extract project name from tags or annotation."""
-    # Look for project tag (common patterns)
-    project_tags = [tag for tag in tags if tag.startswith('project:')]
-    if project_tags:
-      return project_tags[0].replace('project:', '')
+    # One pass: a project tag wins outright (common patterns), otherwise
+    # remember the first client tag. Plain tags cost a single prefix check;
+    # the first letter tells the two identifier prefixes apart.
+    client = None
+    for tag in tags:
+      if tag.startswith(_IDENTIFIER_TAG_PREFIXES):
+        # Sliced names are fresh strings; intern them like the tags so
+        # project grouping and rate lookups compare by identity
+        if tag[0] == 'p':
+          return sys.intern(tag[8:])
+        if client is None:
+          client = sys.intern(tag[7:])
     
-    # Look for client tags
-    client_tags = [tag for tag in tags if tag.startswith('client:')]
-    if client_tags:
-      return client_tags[0].replace('client:', '')
+    if client is not None:
+      return client
     
     # Use first tag as project if no specific project/client tag
     if tags:
@@ -145,15 +317,13 @@ class TimewarriorParser:
     Returns:
       Dictionary mapping project names to lists of entries
     """
-    grouped = {}
+    grouped = defaultdict(list)
     
     for entry in entries:
-      project = entry.project or 'unknown'
-      if project not in grouped:
-        grouped[project] = []
-      grouped[project].append(entry)
+      grouped[entry.project or 'unknown'].append(entry)
     
-    return grouped
+    # Plain dict so lookups of absent projects don't insert empty groups
+    return dict(grouped)
   
   def calculate_billable_hours(self, entries: List[TimeEntry]) -> float:
     """
@@ -165,44 +335,46 @@ class TimewarriorParser:
     Returns:
       Total billable hours as float
     """
-    total_seconds = 0
-    
-    for entry in entries:
-      if entry.end:
-        duration = (entry.end - entry.start).total_seconds()
-        total_seconds += duration
-      elif entry.duration_seconds:
-        total_seconds += entry.duration_seconds
+    total_seconds = sum(map(self._entry_seconds, entries))
     
     return total_seconds / 3600.0  # Convert to hours
   
-  def apply_hourly_rates(self, entries: List[TimeEntry], 
+  @staticmethod
+  def _entry_seconds(entry: TimeEntry) -> float:
+    """Billable seconds of one entry; open intervals count as zero."""
+    # Parsed entries carry their duration; only hand-built ones with an
+    # end time need the datetime subtraction
+    duration = entry.duration_seconds
+    if duration is None and entry.end:
+      duration = (entry.end - entry.start).total_seconds()
+    return duration or 0
+  
+  def apply_hourly_rates(self, entries: Iterable[TimeEntry], 
                         config_manager) -> List[BillableItem]:
     """
     Apply hourly rates to time entries and create billable items.
     
     Args:
-      entries: List of TimeEntry objects
+      entries: TimeEntry objects; any iterable, as they are walked once
       config_manager: ConfigManager instance for rate lookup
     
     Returns:
       List of BillableItem objects
     """
-    billable_items = []
+    # Group by project, then by primary task tag for more granular rate
+    # application, totalling each group's seconds in the same pass
+    grouped_entries = self._group_by_project_and_task(entries)
+    # Each (project, task) pair is a single group, so every rate is looked
+    # up exactly once per call and needs no memoizing here
+    get_client_task_rate = config_manager.get_client_task_rate
     
-    # Group by project first
-    grouped_entries = self.group_by_project(entries)
+    billable_items = []
     
-    for project, project_entries in grouped_entries.items():
-      # Group entries by their primary task tag for more granular rate application
-      task_groups = self._group_by_primary_task(project_entries)
-      
-      for task, task_entries in task_groups.items():
+    for project, task_groups in grouped_entries.items():
+      for task, (seconds, task_entries) in task_groups.items():
         # Find applicable rate for this specific task using config manager
-        rate = config_manager.get_client_task_rate(project, task)
-        
-        # Calculate hours for this task
-        hours = self.calculate_billable_hours(task_entries)
+        rate = get_client_task_rate(project, task)
+        hours = seconds / 3600.0
         
         # Create description from tags and annotations
         description = self._create_description(task_entries)
@@ -220,65 +392,71 @@ class TimewarriorParser:
     
     return billable_items
   
-  def _group_by_primary_task(self, entries: List[TimeEntry]) -> Dict[str, List[TimeEntry]]:
+  def _group_by_project_and_task(self, entries: Iterable[TimeEntry]) -> Dict[str, Dict[str, list]]:
     """
-    Group entries by their primary task tag for more granular rate application.
+    Group entries by project and, within each project, by primary task tag.
+    
+    Keeps first-seen ordering at both levels and walks the entries once,
+    so different rates can apply to different tasks within a project.
+    Project and task names are interned since they are used as keys for
+    the config rate lookups.
     
-    This allows different rates for different tasks within the same project.
+    Returns:
+      Dictionary mapping project names to task -> [total seconds, entries]
     """
-    task_groups = {}
+    grouped = {}
+    entry_seconds = self._entry_seconds
     
     for entry in entries:
-      # Find the primary task tag (first non-project/client tag)
-      primary_task = self._find_primary_task_tag(entry.tags)
+      project = entry.project or 'unknown'
+      task_groups = grouped.get(project)
+      if task_groups is None:
+        task_groups = grouped[sys.intern(project)] = {}
       
-      if primary_task not in task_groups:
-        task_groups[primary_task] = []
-      task_groups[primary_task].append(entry)
+      primary_task = self._find_primary_task_tag(entry.tags)
+      task_group = task_groups.get(primary_task)
+      if task_group is None:
+        task_group = task_groups[sys.intern(primary_task)] = [0, []]
+      task_group[0] += entry_seconds(entry)
+      task_group[1].append(entry)
     
-    return task_groups
+    return grouped
   
-  def _find_primary_task_tag(self, tags: List[str]) -> str:
+  def _find_primary_task_tag(self, tags: Sequence[str]) -> str:
     """
     Find the primary task tag from a list of tags.
     
     Returns the first tag that's not a project/client identifier.
     """
-    # Filter out project/client tags and find the first task tag
-    task_tags = [tag for tag in tags if not tag.startswith(('project:', 'client:'))]
-    
-    # Remove known client names from task tags
-    known_clients = ['madrona', 'goodhertz', 'uhe']
-    task_tags = [tag for tag in task_tags if tag not in known_clients]
-    
-    if task_tags:
-      return task_tags[0]
+    # First tag that is neither a project/client tag nor a known client name
+    for tag in tags:
+      if not tag.startswith(_IDENTIFIER_TAG_PREFIXES) and tag not in _KNOWN_CLIENT_TAGS:
+        return tag
     
     # If no task tag found, use a default
     return "general"
   
   def _create_description(self, entries: List[TimeEntry]) -> str:
     """Create a description from tags and annotations."""
-    descriptions = []
+    # Dict keys dedupe while keeping first-seen order, so the description
+    # is stable from run to run
+    descriptions = {}
     
     for entry in entries:
       if entry.annotation:
-        descriptions.append(entry.annotation)
+        descriptions[entry.annotation] = None
       elif entry.tags:
         # Use tags as description, excluding project/client tags
         tag_descriptions = [tag for tag in entry.tags 
-                          if not tag.startswith(('project:', 'client:'))]
+                          if not tag.startswith(_IDENTIFIER_TAG_PREFIXES)]
         if tag_descriptions:
-          descriptions.append(', '.join(tag_descriptions))
+          descriptions[', '.join(tag_descriptions)] = None
     
     if descriptions:
-      return '; '.join(set(descriptions))  # Remove duplicates
+      return '; '.join(descriptions)
     else:
       return "Time tracking"
   
   def _get_unique_tags(self, entries: List[TimeEntry]) -> List[str]:
-    """Get unique tags from a list of entries."""
-    all_tags = []
-    for entry in entries:
-      all_tags.extend(entry.tags)
-    return list(set(all_tags)) 
\ No newline at end of file
+    """Get unique tags from a list of entries, in first-seen order."""
+    return list(dict.fromkeys(chain.from_iterable(map(_get_tags, entries))))
\ No newline at end of file
@@ -0,0 +1,125 @@
+"""
+Tests for configuration management module.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from src.config import ConfigManager, config_cache_info
+
+
+class TestConfigCache(unittest.TestCase):
+  """Test cases for the parsed-configuration cache."""
+
+  def setUp(self):
+    """Write a small configuration file to a temporary directory."""
+    self.temp_dir = tempfile.mkdtemp()
+    self.config_path = os.path.join(self.temp_dir, "config.yaml")
+    self._write_config(150.0)
+
+  def tearDown(self):
+    """Remove the temporary directory."""
+    shutil.rmtree(self.temp_dir)
+
+  def _write_config(self, rate: float):
+    """Write a configuration with the given default hourly rate."""
+    with open(self.config_path, 'w', encoding='utf-8') as f:
+      f.write(
+        "biller:\n"
+        "  name: John Matter\n"
+        "clients:\n"
+        "  madrona:\n"
+        "    name: Madrona Labs\n"
+        "    prefix: madrona\n"
+        "    rates:\n"
+        "      development: 120.0\n"
+        "hourly_rates:\n"
+        f"  default: {rate}\n"
+      )
+
+  def test_unchanged_file_is_parsed_once(self):
+    """Test that reloading an unchanged file is a cache hit."""
+    before = config_cache_info()
+
+    first = ConfigManager(self.config_path).load_config()
+    second = ConfigManager(self.config_path).load_config()
+
+    after = config_cache_info()
+    self.assertIsNot(first, second)
+    self.assertEqual(first.clients, second.clients)
+    self.assertEqual(after['misses'] - before['misses'], 1)
+    self.assertEqual(after['hits'] - before['hits'], 1)
+
+  def test_modified_file_is_reparsed(self):
+    """Test that a changed file is parsed again."""
+    first = ConfigManager(self.config_path).load_config()
+
+    self._write_config(175.0)
+    stat = os.stat(self.config_path)
+    os.utime(self.config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    second = ConfigManager(self.config_path).load_config()
+    self.assertIsNot(first, second)
+    self.assertEqual(second.default_hourly_rate, 175.0)
+
+  def test_cached_config_is_not_shared(self):
+    """Test that changes through one manager don't reach later loads."""
+    first = ConfigManager(self.config_path).load_config()
+    first.clients['madrona']['rates']['development'] = 999.0
+
+    second = ConfigManager(self.config_path).load_config()
+    self.assertEqual(second.clients['madrona']['rates']['development'], 120.0)
+
+  def test_use_cache_false(self):
+    """Test that use_cache=False always parses the file."""
+    first = ConfigManager(self.config_path).load_config()
+    second = ConfigManager(self.config_path).load_config(use_cache=False)
+
+    self.assertIsNot(first, second)
+    self.assertEqual(second.clients, first.clients)
+
+    # An uncached load doesn't store its result for later callers
+    self._write_config(160.0)
+    stat = os.stat(self.config_path)
+    os.utime(self.config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    ConfigManager(self.config_path).load_config(use_cache=False)
+    before = config_cache_info()
+    ConfigManager(self.config_path).load_config()
+    self.assertEqual(config_cache_info()['misses'] - before['misses'], 1)
+
+  def test_accessors_load_lazily(self):
+    """Test that accessors load the configuration on first use."""
+    manager = ConfigManager(self.config_path)
+
+    self.assertEqual(manager.get_client('madrona')['name'], "Madrona Labs")
+    self.assertEqual(manager.get_hourly_rate('unknown'), 150.0)
+
+  def test_validate_config_clients(self):
+    """Test that clients missing a name or prefix are reported in order."""
+    manager = ConfigManager(self.config_path)
+    config = manager.load_config(use_cache=False)
+    config.clients = {
+      'complete': {'name': 'Complete', 'prefix': 'c'},
+      'bare': {}
+    }
+
+    errors = manager.validate_config(config)
+    self.assertEqual(errors[-2:], [
+      "Client 'bare' name is required",
+      "Client 'bare' prefix is required"
+    ])
+    self.assertNotIn("Client 'complete' name is required", errors)
+
+  def test_client_task_rate(self):
+    """Test client task rate lookup and its fallbacks."""
+    manager = ConfigManager(self.config_path)
+
+    self.assertEqual(manager.get_client_task_rate('madrona', 'development'), 120.0)
+    # No client default rate, so the global default applies
+    self.assertEqual(manager.get_client_task_rate('madrona', 'design'), 150.0)
+    self.assertEqual(manager.get_client_task_rate('unknown', 'design'), 150.0)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -6,7 +6,8 @@ import unittest
 from datetime import datetime, date
 from src.models import (
   Address, Client, Biller, BillableItem, Invoice,
-  InvoiceNumberGenerator, InvoiceCalculator, InvoiceValidator
+  InvoiceNumberGenerator, InvoiceCalculator, InvoiceValidator,
+  InvoiceValidationError
 )
 
 
@@ -251,12 +252,22 @@ class TestInvoiceCalculator(unittest.TestCase):
     
     subtotal = InvoiceCalculator.calculate_subtotal(items)
     self.assertEqual(subtotal, 950.0)
+    
+    # Many fractional amounts add up exactly rather than drifting
+    items = [BillableItem("Call", 0.1, 1.0, 0.1, "project")] * 10
+    self.assertEqual(InvoiceCalculator.calculate_subtotal(items), 1.0)
   
   def test_calculate_tax(self):
     """Test tax calculation."""
     tax_amount = InvoiceCalculator.calculate_tax(1000.0, 0.08)
     self.assertEqual(tax_amount, 80.0)
   
+  def test_calculate_tax_rounds_half_up(self):
+    """Test that tax is rounded to cents with halves rounded up."""
+    self.assertEqual(InvoiceCalculator.calculate_tax(100.5, 0.01), 1.01)
+    self.assertEqual(InvoiceCalculator.calculate_tax(1002.5, 0.001), 1.0)
+    self.assertIsInstance(InvoiceCalculator.calculate_tax(1000.0, 0.08), float)
+  
   def test_calculate_total(self):
     """Test total calculation."""
     total = InvoiceCalculator.calculate_total(1000.0, 80.0)
@@ -327,6 +338,33 @@ class TestInvoiceValidator(unittest.TestCase):
     self.assertIn("Client name is required", errors)
     self.assertIn("At least one billable item is required", errors)
   
+  def test_validate_on_construction(self):
+    """Test fail-fast validation while constructing an invoice."""
+    invoice = Invoice(
+      invoice_number="madrona-a23fa87c",
+      issue_date=date(2024, 1, 15),
+      due_date=date(2024, 2, 14),
+      biller=self.biller,
+      client=self.client,
+      billable_items=self.billable_items,
+      validate=True
+    )
+    self.assertEqual(invoice.total_amount, 750.0)
+    
+    with self.assertRaises(InvoiceValidationError) as context:
+      Invoice(
+        invoice_number="",
+        issue_date=date(2024, 1, 15),
+        due_date=date(2024, 2, 14),
+        biller=Biller(name=""),
+        client=self.client,
+        billable_items=[],
+        validate=True
+      )
+    
+    # Only the first error is reported
+    self.assertEqual(context.exception.errors, ["Invoice number is required"])
+  
   def test_validate_billable_item(self):
     """Test billable item validation."""
     # Valid item
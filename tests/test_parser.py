@@ -2,21 +2,69 @@
 Tests for Timewarrior data parser module.
 """
 
+import io
 import unittest
 from datetime import datetime, timezone
-from unittest.mock import Mock
 from src.parser import TimewarriorParser, TimeEntry, BillableItem
 
 
+# Single-purpose exports for the rate tests
+_TWO_TASK_JSON = '''[
+  {
+    "start": "2024-01-15T09:00:00Z",
+    "end": "2024-01-15T12:00:00Z",
+    "tags": ["madrona", "development"],
+    "annotation": "Development work"
+  },
+  {
+    "start": "2024-01-15T13:00:00Z",
+    "end": "2024-01-15T17:00:00Z",
+    "tags": ["madrona", "consulting"],
+    "annotation": "Consulting work"
+  }
+]'''
+
+_CONSULTING_JSON = '''[
+  {
+    "start": "2024-01-15T09:00:00Z",
+    "end": "2024-01-15T12:00:00Z",
+    "tags": ["madrona", "consulting"],
+    "annotation": "Premium consulting"
+  }
+]'''
+
+_GOODHERTZ_JSON = '''[
+  {
+    "start": "2024-01-15T09:00:00Z",
+    "end": "2024-01-15T10:00:00Z",
+    "tags": ["goodhertz", "documentation"],
+    "annotation": "Documentation work"
+  }
+]'''
+
+
+class _FakeConfig:
+  """Minimal config manager stand-in that records rate lookups."""
+  
+  def __init__(self, rate_for):
+    self.rate_for = rate_for
+    self.calls = []
+  
+  def get_client_task_rate(self, client, task):
+    self.calls.append((client, task))
+    return self.rate_for(client, task)
+
+
 class TestTimewarriorParser(unittest.TestCase):
   """Test cases for TimewarriorParser class."""
   
-  def setUp(self):
-    """Set up test fixtures."""
-    self.parser = TimewarriorParser()
+  @classmethod
+  def setUpClass(cls):
+    """Set up fixtures shared by all tests; the parser is stateless."""
+    cls.parser = TimewarriorParser()
     
     # Sample JSON data from timew export
-    self.sample_json = '''[
+    cls.sample_json = '''[
       {
         "start": "2024-01-15T09:00:00Z",
         "end": "2024-01-15T12:00:00Z",
@@ -30,6 +78,10 @@ class TestTimewarriorParser(unittest.TestCase):
         "annotation": "Unit tests for new feature"
       }
     ]'''
+    
+    # Entries for tests that only consume parsed data; test_parse_json_data
+    # and the cache tests exercise the parse path itself
+    cls.sample_entries = cls.parser.parse_export_data(cls.sample_json, 'json', use_cache=False)
   
   def test_parse_json_data(self):
     """Test parsing JSON format Timewarrior data."""
@@ -44,9 +96,38 @@ class TestTimewarriorParser(unittest.TestCase):
     self.assertEqual(first_entry.start, expected_start)
     expected_end = datetime(2024, 1, 15, 12, 0, 0, tzinfo=timezone.utc)
     self.assertEqual(first_entry.end, expected_end)
-    self.assertEqual(first_entry.tags, ["madrona", "development", "bugfix"])
+    self.assertEqual(first_entry.tags, ("madrona", "development", "bugfix"))
     self.assertEqual(first_entry.annotation, "Fixed audio processing bug")
     self.assertEqual(first_entry.project, "madrona")
+    self.assertEqual(first_entry.duration_seconds, 3 * 3600)
+    
+    # Repeated tags are interned to a single string object
+    self.assertIs(first_entry.tags[0], entries[1].tags[0])
+  
+  def test_parse_csv_data(self):
+    """Test parsing CSV format Timewarrior data."""
+    csv_data = (
+      'start,end,tags,annotation\n'
+      '2024-01-15T09:00:00Z,2024-01-15T12:00:00Z,"madrona, development",Fixed bug\n'
+      '\n'
+      '2024-01-16T09:00:00Z,,client:goodhertz\n'
+    )
+    entries = self.parser.parse_export_data(csv_data, 'csv')
+    
+    self.assertEqual(len(entries), 2)
+    self.assertEqual(entries[0].tags, ("madrona", "development"))
+    self.assertEqual(entries[0].annotation, "Fixed bug")
+    self.assertEqual(entries[0].duration_seconds, 3 * 3600)
+    self.assertIsNone(entries[1].end)
+    self.assertIsNone(entries[1].annotation)
+    self.assertEqual(entries[1].project, "goodhertz")
+    
+    with self.assertRaises(ValueError):
+      self.parser.parse_export_data('end,tags\n2024-01-15T12:00:00Z,madrona\n', 'csv')
+    
+    # A short row missing its start is an error, not an entry without a start
+    with self.assertRaises(ValueError):
+      self.parser.parse_export_data('tags,start\nmadrona\n', 'csv', use_cache=False)
   
   def test_extract_project(self):
     """Test project extraction from tags."""
@@ -60,6 +141,11 @@ class TestTimewarriorParser(unittest.TestCase):
     project = self.parser._extract_project(tags, None)
     self.assertEqual(project, "goodhertz")
     
+    # Test that a later project tag takes priority over a client tag
+    tags = ["client:goodhertz", "consulting", "project:madrona"]
+    project = self.parser._extract_project(tags, None)
+    self.assertEqual(project, "madrona")
+    
     # Test with first tag as project
     tags = ["madrona", "development"]
     project = self.parser._extract_project(tags, None)
@@ -69,9 +155,29 @@ class TestTimewarriorParser(unittest.TestCase):
     project = self.parser._extract_project([], None)
     self.assertIsNone(project)
   
+  def test_find_primary_task_tag(self):
+    """Test that project/client tags and client names are skipped."""
+    tags = ["client:goodhertz", "madrona", "project:x", "mixing", "review"]
+    self.assertEqual(self.parser._find_primary_task_tag(tags), "mixing")
+    self.assertEqual(self.parser._find_primary_task_tag(["uhe"]), "general")
+    self.assertEqual(self.parser._find_primary_task_tag([]), "general")
+  
+  def test_create_description(self):
+    """Test descriptions and tags are deduplicated in first-seen order."""
+    start = datetime(2024, 1, 15, 9, 0, 0)
+    entries = [
+      TimeEntry(start=start, end=None, tags=[], annotation="Mixing", project=None),
+      TimeEntry(start=start, end=None, tags=["client:uhe", "review"], annotation=None, project=None),
+      TimeEntry(start=start, end=None, tags=[], annotation="Mixing", project=None),
+      TimeEntry(start=start, end=None, tags=["project:uhe"], annotation=None, project=None),
+    ]
+    self.assertEqual(self.parser._create_description(entries), "Mixing; review")
+    self.assertEqual(self.parser._create_description(entries[3:]), "Time tracking")
+    self.assertEqual(self.parser._get_unique_tags(entries), ["client:uhe", "review", "project:uhe"])
+  
   def test_group_by_project(self):
     """Test grouping entries by project."""
-    entries = self.parser.parse_export_data(self.sample_json, 'json')
+    entries = list(self.sample_entries)
     grouped = self.parser.group_by_project(entries)
     
     self.assertIn("madrona", grouped)
@@ -79,7 +185,7 @@ class TestTimewarriorParser(unittest.TestCase):
   
   def test_calculate_billable_hours(self):
     """Test billable hours calculation."""
-    entries = self.parser.parse_export_data(self.sample_json, 'json')
+    entries = list(self.sample_entries)
     hours = self.parser.calculate_billable_hours(entries)
     
     # 3 hours + 4 hours = 7 hours
@@ -87,11 +193,10 @@ class TestTimewarriorParser(unittest.TestCase):
   
   def test_apply_hourly_rates(self):
     """Test applying hourly rates to entries."""
-    entries = self.parser.parse_export_data(self.sample_json, 'json')
+    entries = list(self.sample_entries)
     
     # Create mock config manager
-    mock_config = Mock()
-    mock_config.get_client_task_rate.return_value = 150.0
+    mock_config = _FakeConfig(lambda client, task: 150.0)
     
     billable_items = self.parser.apply_hourly_rates(entries, mock_config)
     
@@ -105,30 +210,36 @@ class TestTimewarriorParser(unittest.TestCase):
     self.assertEqual(total_amount, 1050.0)  # 7 hours * 150.0
     
     # Verify config manager was called correctly
-    mock_config.get_client_task_rate.assert_called()
+    self.assertTrue(mock_config.calls)
+    
+    # Rates are looked up once per (project, task) pair, however many
+    # entries share it
+    mock_config.calls.clear()
+    billable_items = self.parser.apply_hourly_rates(entries * 3, mock_config)
+    self.assertEqual(len(mock_config.calls), 2)
+    self.assertEqual(sum(item.hours_worked for item in billable_items), 21.0)
+  
+  def test_parse_json_stream(self):
+    """Test streamed entries match the parsed ones and feed rate application."""
+    stream = io.BytesIO(self.sample_json.encode('utf-8'))
+    streamed = self.parser.parse_json_stream(stream)
+    
+    mock_config = _FakeConfig(lambda client, task: 150.0)
+    
+    billable_items = self.parser.apply_hourly_rates(streamed, mock_config)
+    expected = self.parser.apply_hourly_rates(
+      list(self.sample_entries), mock_config)
+    self.assertEqual(billable_items, expected)
+    
+    with self.assertRaises(ValueError):
+      list(self.parser.parse_json_stream(io.BytesIO(b'[{"start": ')))
   
   def test_per_task_rates(self):
     """Test per-task rate application."""
-    # Create entries with different tasks
-    sample_data = '''[
-      {
-        "start": "2024-01-15T09:00:00Z",
-        "end": "2024-01-15T12:00:00Z",
-        "tags": ["madrona", "development"],
-        "annotation": "Development work"
-      },
-      {
-        "start": "2024-01-15T13:00:00Z",
-        "end": "2024-01-15T17:00:00Z",
-        "tags": ["madrona", "consulting"],
-        "annotation": "Consulting work"
-      }
-    ]'''
-    
-    entries = self.parser.parse_export_data(sample_data, 'json')
+    # Entries with different tasks
+    entries = self.parser.parse_export_data(_TWO_TASK_JSON, 'json')
     
     # Create mock config manager that returns different rates for different tasks
-    mock_config = Mock()
     def mock_get_rate(client, task):
       if task == "development":
         return 140.0
@@ -137,7 +248,7 @@ class TestTimewarriorParser(unittest.TestCase):
       else:
         return 150.0
     
-    mock_config.get_client_task_rate.side_effect = mock_get_rate
+    mock_config = _FakeConfig(mock_get_rate)
     
     billable_items = self.parser.apply_hourly_rates(entries, mock_config)
     
@@ -158,20 +269,10 @@ class TestTimewarriorParser(unittest.TestCase):
   
   def test_client_specific_task_rates(self):
     """Test client-specific task rate application."""
-    sample_data = '''[
-      {
-        "start": "2024-01-15T09:00:00Z",
-        "end": "2024-01-15T12:00:00Z",
-        "tags": ["madrona", "consulting"],
-        "annotation": "Premium consulting"
-      }
-    ]'''
-    
-    entries = self.parser.parse_export_data(sample_data, 'json')
+    entries = self.parser.parse_export_data(_CONSULTING_JSON, 'json')
     
     # Create mock config manager
-    mock_config = Mock()
-    mock_config.get_client_task_rate.return_value = 225.0
+    mock_config = _FakeConfig(lambda client, task: 225.0)
     
     billable_items = self.parser.apply_hourly_rates(entries, mock_config)
     
@@ -181,34 +282,77 @@ class TestTimewarriorParser(unittest.TestCase):
   
   def test_rate_precedence(self):
     """Test rate precedence using config manager."""
-    sample_data = '''[
-      {
-        "start": "2024-01-15T09:00:00Z",
-        "end": "2024-01-15T10:00:00Z",
-        "tags": ["goodhertz", "documentation"],
-        "annotation": "Documentation work"
-      }
-    ]'''
-    
-    entries = self.parser.parse_export_data(sample_data, 'json')
+    entries = self.parser.parse_export_data(_GOODHERTZ_JSON, 'json')
     
     # Create mock config manager that simulates the precedence logic
-    mock_config = Mock()
-    mock_config.get_client_task_rate.return_value = 140.0  # Goodhertz documentation rate
+    mock_config = _FakeConfig(lambda client, task: 140.0)  # Goodhertz documentation rate
     
     billable_items = self.parser.apply_hourly_rates(entries, mock_config)
     
     self.assertEqual(billable_items[0].hourly_rate, 140.0)
   
+  def test_parse_cache(self):
+    """Test that identical export data is served from the parse cache."""
+    first = self.parser.parse_export_data(self.sample_json, 'json')
+    second = self.parser.parse_export_data(self.sample_json, 'json')
+    
+    # Equal entries, but callers get their own copies
+    self.assertIsNot(first, second)
+    self.assertEqual(first, second)
+    
+    # Modifying a returned entry must not leak into later cache hits
+    first[0].project = "changed"
+    third = self.parser.parse_export_data(self.sample_json, 'json')
+    self.assertEqual(third[0].project, "madrona")
+    
+    uncached = self.parser.parse_export_data(self.sample_json, 'json', use_cache=False)
+    self.assertIsNot(uncached[0], first[0])
+    self.assertEqual(uncached, second)
+  
+  def test_parse_json_bytes(self):
+    """Test parsing JSON export data passed as raw bytes."""
+    entries = self.parser.parse_export_data(self.sample_json.encode('utf-8'), 'json')
+    
+    self.assertEqual(len(entries), 2)
+    self.assertEqual(entries[0].tags, ("madrona", "development", "bugfix"))
+  
+  def test_parse_back_to_back_intervals(self):
+    """Test that an interval starting at the previous end gets that datetime."""
+    data = '''[
+      {"start": "20240115T090000Z", "end": "20240115T120000Z", "tags": ["madrona"]},
+      {"start": "20240115T120000Z", "end": "20240115T130000Z", "tags": ["madrona"]},
+      {"start": "20240115T140000Z", "tags": ["madrona"]}
+    ]'''
+    entries = self.parser.parse_export_data(data, 'json', use_cache=False)
+    
+    self.assertEqual(entries[1].start, datetime(2024, 1, 15, 12, tzinfo=timezone.utc))
+    self.assertEqual(entries[1].start, entries[0].end)
+    # UTC timestamps share the timezone.utc singleton, so interval
+    # subtraction takes the same-tzinfo fast path
+    self.assertIs(entries[0].start.tzinfo, timezone.utc)
+    self.assertIs(entries[2].start.tzinfo, entries[0].end.tzinfo)
+    self.assertEqual(entries[2].start, datetime(2024, 1, 15, 14, tzinfo=timezone.utc))
+    self.assertIsNone(entries[2].end)
+    self.assertIsNone(entries[2].duration_seconds)
+    self.assertEqual(self.parser.calculate_billable_hours(entries), 4.0)
+  
   def test_invalid_json(self):
     """Test handling of invalid JSON data."""
-    with self.assertRaises(ValueError):
+    with self.assertRaises(ValueError) as context:
       self.parser.parse_export_data("invalid json", 'json')
+    self.assertIsNotNone(context.exception.__cause__)
+  
+  def test_invalid_utf8_json(self):
+    """Test that undecodable export bytes are reported as invalid JSON."""
+    with self.assertRaisesRegex(ValueError, "Invalid JSON data"):
+      self.parser.parse_export_data(b'[{"start": "\xff"}]', 'json')
   
   def test_unsupported_format(self):
     """Test handling of unsupported format."""
     with self.assertRaises(ValueError):
       self.parser.parse_export_data("data", 'xml')
+    with self.assertRaises(ValueError):
+      self.parser.parse_export_data(b"data", 'xml', use_cache=False)
 
 
 class TestTimeEntry(unittest.TestCase):